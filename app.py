@@ -1,15 +1,37 @@
+import os
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import pydeck as pdk
 from datetime import datetime
+from creditfraud.dashboard.cube import ROW_COLUMNS, FraudCube
+from creditfraud.dashboard.distributions import amount_edges, amount_histogram, amount_quantiles, hour_counts
+from creditfraud.dashboard.export import EXPORT_FORMATS, FilteredExport
+from creditfraud.dashboard.filters import TransactionIndex, compact_frame
+from creditfraud.dashboard.spatial import SpatialBins
+from creditfraud.utils.partitioned import is_partitioned, read_manifest, read_partitioned
 
 st.set_page_config(layout="wide", page_title="Credit Fraud Explorer", initial_sidebar_state="expanded")
 
-@st.cache_data(show_spinner=False)
-def load_data(path: str):
-    df = pd.read_csv(path)
+# Map payload bounds: raw points up to this many rows, then at most this many grid cells per layer
+RAW_POINT_LIMIT = 5000
+MAX_MAP_CELLS = 5000
+
+# Partitioned dataset written by ingestion, or a plain CSV next to the app
+DATASET_DIR = "artifacts/data_ingestion/dataset"
+
+# Cached as a shared resource: the frame, cube, index and map bins are built once and never mutated.
+# Each month/state selection is its own entry, so only the most recent few are kept in memory
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_data(path: str, months: tuple = (), states: tuple = ()):
+    if is_partitioned(path):
+        # Month and state filters are pushed down: only matching partitions are read
+        start = f"{months[0]}-01" if months else None
+        end = (pd.Period(months[1]).end_time.date().isoformat()) if months else None
+        df = read_partitioned(path, start_date=start, end_date=end, states=list(states)).to_pandas()
+    else:
+        df = pd.read_csv(path)
 
     if 'Unnamed: 0' in df.columns:
         df = df.drop(columns=['Unnamed: 0'])
@@ -34,11 +56,29 @@ def load_data(path: str):
     for c in ['lat','long','merch_lat','merch_long']:
         if c in df.columns:
             df[c] = pd.to_numeric(df[c], errors='coerce')
-    return df
-
 
-path = "fraud_test.csv"
-df = load_data(path)
+    df = compact_frame(df)
+    spatial = {
+        'customer': SpatialBins(df['lat'], df['long'], df['is_fraud']),
+        'merchant': SpatialBins(df['merch_lat'], df['merch_long'], df['is_fraud']),
+    }
+    return df, FraudCube.from_rows(df, sketches=True), TransactionIndex(df), spatial
+
+
+path = DATASET_DIR if is_partitioned(DATASET_DIR) else "fraud_test.csv"
+load_months, load_states = (), ()
+if is_partitioned(path):
+    manifest = read_manifest(path)
+    partitions = [f["partition"] for f in manifest["files"]]
+    all_months = sorted({p["month"] for p in partitions if p.get("month")})
+    with st.sidebar.expander("Data loaded"):
+        if all_months:
+            chosen = st.select_slider("Months", options=all_months, value=(all_months[0], all_months[-1]))
+            # The full range reads everything and shares the default cache entry
+            if chosen != (all_months[0], all_months[-1]):
+                load_months = tuple(chosen)
+        load_states = tuple(st.multiselect("States (blank = all)", options=sorted({p["state"] for p in partitions if p.get("state")})))
+df, cube, index, spatial = load_data(path, load_months, load_states)
 
 
 print(df.columns)
@@ -52,76 +92,88 @@ max_date = df['trans_dt'].max()
 date_range = st.sidebar.date_input("Transaction date range", value=(min_date.date(), max_date.date()))
 start_date, end_date = date_range if isinstance(date_range, tuple) else (date_range, date_range)
 
-amt_min = float(df['amt'].min())
-amt_max = float(df['amt'].quantile(0.995))
-amt_range = st.sidebar.slider("Amount range (USD)", min_value=0.0, max_value=float(df['amt'].max()), value=(amt_min, amt_max), step=1.0)
+amt_min, amt_max = index.amt_min, index.amt_max
+amt_range = st.sidebar.slider("Amount range (USD)", min_value=0.0, max_value=amt_max, value=(amt_min, amt_max), step=1.0)
 
-states = sorted(df['state'].dropna().unique())
+states = list(df['state'].cat.categories)
 selected_states = st.sidebar.multiselect("States (leave blank = all)", options=states, default=[])
 
-merchants = sorted(df['merchant'].dropna().unique())
+merchants = list(df['merchant'].cat.categories)
 selected_merchants = st.sidebar.multiselect("Merchants (sample)", options=merchants[:200], default=[])
 
 fraud_mode = st.sidebar.selectbox("Show", options=["Both", "Fraud only", "Non-fraud only"])
 
 agg_by = st.sidebar.selectbox("Aggregate time by", options=["D (day)", "W (week)", "M (month)"], index=0)
+kpi_mode = st.sidebar.radio("Distinct counts and quantiles", options=["Approximate (sketches)", "Exact"], help="Approximate merges per-cell HyperLogLog and DDSketch sketches instead of scanning the filtered rows.")
 refresh = st.sidebar.button("Refresh / Apply filters")
 
 
-filtered = df.copy()
-filtered = filtered[filtered['trans_dt'].notna()] 
-
-filtered = filtered[(filtered['trans_dt'].dt.date >= start_date) & (filtered['trans_dt'].dt.date <= end_date)]
-filtered = filtered[(filtered['amt'] >= amt_range[0]) & (filtered['amt'] <= amt_range[1])]
+# Date range is a sorted slice, state/merchant a code lookup, see TransactionIndex
+# Rows are only copied where a chart needs them: the snapshot, small maps and amount roll-ups
+positions = index.select(start_date, end_date, amt_range, selected_states, selected_merchants, fraud_mode)
+sel_amt = index.amt[positions]
+sel_fraud = index.is_fraud[positions].astype(np.int64)
 
-if selected_states:
-    filtered = filtered[filtered['state'].isin(selected_states)]
-if selected_merchants:
-    filtered = filtered[filtered['merchant'].isin(selected_merchants)]
-
-if fraud_mode == "Fraud only":
-    filtered = filtered[filtered['is_fraud'] == 1]
-elif fraud_mode == "Non-fraud only":
-    filtered = filtered[filtered['is_fraud'] == 0]
+# Aggregates come from the pre-built cube. The cube has no amount dimension,
+# so a narrowed amount range rolls up the filtered rows into a cube instead.
+if amt_range[0] <= amt_min and amt_range[1] >= amt_max:
+    selected = cube.select(start_date, end_date, selected_states, selected_merchants, fraud_mode)
+else:
+    selected = FraudCube.from_rows(index.rows(positions, ROW_COLUMNS))
+# Sketches only cover cube cells, so a narrowed amount range falls back to exact
+approximate = kpi_mode.startswith("Approximate") and selected.sketches is not None
 
 
 st.title("Credit Fraud Explorer — Interactive Dashboard")
-kpi1, kpi2, kpi3, kpi4 = st.columns(4)
-
-total_tx = len(filtered)
-fraud_tx = int(filtered['is_fraud'].sum())
-fraud_rate = 100 * fraud_tx / total_tx if total_tx > 0 else 0
-avg_amt = filtered['amt'].mean() if total_tx > 0 else 0
-unique_merchants = filtered['merchant'].nunique()
+kpi1, kpi2, kpi3, kpi4, kpi5, kpi6 = st.columns(6)
+
+kpis = selected.kpis()
+total_tx = kpis['total']
+fraud_tx = kpis['frauds']
+fraud_rate = kpis['fraud_rate']
+avg_amt = kpis['avg_amt']
+if approximate:
+    approx = selected.approximate_kpis()
+    unique_merchants = round(approx['unique_merchants'])
+    unique_cards = round(approx['unique_cards'])
+    median_amt = approx['median_amt']
+else:
+    unique_merchants = kpis['unique_merchants']
+    unique_cards = index.distinct_cards(positions)
+    median_amt = float(np.median(sel_amt)) if len(sel_amt) else 0.0
+prefix = "~" if approximate else ""
 
 kpi1.metric("Transactions (filtered)", f"{total_tx:,}")
 kpi2.metric("Fraudulent tx", f"{fraud_tx:,}", f"{fraud_rate:.2f}%")
 kpi3.metric("Avg. Amount (USD)", f"${avg_amt:,.2f}")
-kpi4.metric("Unique Merchants", f"{unique_merchants:,}")
+kpi4.metric("Median Amount (USD)", f"{prefix}${median_amt:,.2f}")
+kpi5.metric("Unique Merchants", f"{prefix}{unique_merchants:,}")
+kpi6.metric("Unique Cards", f"{prefix}{unique_cards:,}")
+if approximate:
+    st.caption("~ Approximate: distinct counts within about ±3% (HyperLogLog, 95% confidence), quantiles within 1% relative error (DDSketch). Switch to Exact in the sidebar for exact values.")
 
 
 left_col, right_col = st.columns((2,1))
 
 with left_col:
     st.subheader("Transactions over time")
-    ts = filtered.copy()
     freq_map = {"D (day)":"D", "W (week)":"W", "M (month)":"M"}
     agg_freq = freq_map.get(agg_by, "D")
-    ts['period'] = ts['trans_dt'].dt.to_period(agg_freq).dt.to_timestamp()
-    ts_agg = ts.groupby('period').agg(total=('trans_dt','count'), frauds=('is_fraud','sum'), avg_amt=('amt','mean')).reset_index()
-    ts_agg['fraud_rate'] = 100 * ts_agg['frauds'] / ts_agg['total']
+    ts_agg = selected.timeseries(agg_freq)
     fig_ts = px.line(ts_agg, x='period', y=['total','frauds'], labels={'value':'count','period':'date'}, title="Transactions and Fraud Counts")
     fig_ts.update_traces(mode='lines+markers')
     st.plotly_chart(fig_ts, use_container_width=True)
 
     st.subheader("Amount distribution by Fraud label")
-    fig_amt = px.violin(filtered, x='is_fraud', y='amt', box=True, points='outliers', labels={'is_fraud':'is_fraud','amt':'Amount (USD)'}, title='Transaction Amount Distribution (Fraud vs Non-Fraud)')
+    # Binned on the server: the chart gets a fixed number of bars whatever the row count
+    amt_hist = amount_histogram(sel_amt, sel_fraud, amount_edges(amt_max))
+    fig_amt = px.bar(amt_hist, x='amount', y='share', color='is_fraud', barmode='overlay', opacity=0.6, log_x=True, hover_data=['amount_from','amount_to','count'], labels={'amount':'Amount (USD)','share':'Share of class'}, title='Transaction Amount Distribution (Fraud vs Non-Fraud)')
     st.plotly_chart(fig_amt, use_container_width=True)
+    amt_quantiles = selected.approximate_amount_quantiles() if approximate else amount_quantiles(sel_amt, sel_fraud)
+    st.dataframe(amt_quantiles.style.format("${:,.2f}"))
 
     st.subheader("Fraud rate by U.S. state")
-    fraud_by_state = filtered.groupby('state').agg(total=('trans_dt','count'), frauds=('is_fraud','sum')).reset_index()
-    fraud_by_state['fraud_rate'] = fraud_by_state['frauds']/fraud_by_state['total']
-    fraud_by_state = fraud_by_state[fraud_by_state['state'].notna()]
+    fraud_by_state = selected.by_state()
     if not fraud_by_state.empty:
         fig_state = px.choropleth(fraud_by_state, locations='state', locationmode='USA-states', color='fraud_rate', color_continuous_scale='Reds', scope='usa', hover_data=['total','frauds'], labels={'fraud_rate':'Fraud rate'})
         fig_state.update_layout(margin=dict(l=0,r=0,t=30,b=0))
@@ -131,7 +183,7 @@ with left_col:
 
 with right_col:
     st.subheader("Merchant / Category breakdown")
-    sb = filtered.groupby(['merchant','category']).size().reset_index(name='count')
+    sb = selected.by_merchant_category()
     if not sb.empty:
         top_sb = sb.sort_values('count', ascending=False).head(200)
         fig_sb = px.sunburst(top_sb, path=['category','merchant'], values='count', maxdepth=3, title="Top merchants by category")
@@ -140,55 +192,76 @@ with right_col:
         st.info("No merchant/category data to show.")
 
     st.subheader("Data snapshot")
-    st.dataframe(filtered.head(200))
-    csv = filtered.to_csv(index=False)
-    st.download_button(label="Download filtered CSV", data=csv, file_name="filtered_fraud_data.csv", mime="text/csv")
+    st.dataframe(index.rows(positions[:200]))
+    # The export is only written when the button is clicked, then reused for the same filters
+    export_format = st.radio("Export format", options=list(EXPORT_FORMATS), horizontal=True)
+    extension, mime = EXPORT_FORMATS[export_format]
+    filter_state = (path, os.path.getmtime(path), load_months, load_states, start_date, end_date, amt_range, tuple(selected_states), tuple(selected_merchants), fraud_mode)
+    st.download_button(
+        label=f"Download filtered {export_format}",
+        data=FilteredExport(df).loader(positions, filter_state, export_format),
+        file_name=f"filtered_fraud_data.{extension}",
+        mime=mime,
+        on_click="ignore",
+    )
 
 st.subheader("Geospatial Overview — Customer & Merchant locations (PyDeck)")
 map_options = st.multiselect("Map layers to show", options=["Customer heatmap","Merchant heatmap","Customer scatter","Merchant scatter"], default=["Customer heatmap","Customer scatter"])
+map_zoom = st.slider("Map detail (zoom level)", min_value=2, max_value=12, value=4)
+
+center_lat = np.nanmedian(spatial['customer'].lat[positions]) if len(positions) else 37.0902
+center_lon = np.nanmedian(spatial['customer'].lon[positions]) if len(positions) else -95.7129
+initial_view_state = pdk.ViewState(latitude=float(center_lat), longitude=float(center_lon), zoom=map_zoom, pitch=40)
 
-center_lat = filtered['lat'].median() if 'lat' in filtered.columns else 37.0902
-center_lon = filtered['long'].median() if 'long' in filtered.columns else -95.7129
-initial_view_state = pdk.ViewState(latitude=float(center_lat), longitude=float(center_lon), zoom=4, pitch=40)
+# Points are binned server-side; raw rows are only sent for small selections
+raw_points = len(positions) <= RAW_POINT_LIMIT
+points = index.rows(positions, ['lat','long','merch_lat','merch_long','is_fraud','amt','city','merchant']) if raw_points else None
+customer_cells = spatial['customer'].cells(positions, map_zoom, MAX_MAP_CELLS)
+merchant_cells = spatial['merchant'].cells(positions, map_zoom, MAX_MAP_CELLS)
 
 layers = []
-if "Customer heatmap" in map_options and 'lat' in filtered.columns and 'long' in filtered.columns:
-    heat_data = filtered[['lat','long','is_fraud']].dropna()
-    if not heat_data.empty:
-        layers.append(pdk.Layer("HeatmapLayer", data=heat_data, get_position=['long','lat'], aggregation='SUM', get_weight='is_fraud + 1e-6'))
-
-if "Merchant heatmap" in map_options and 'merch_lat' in filtered.columns and 'merch_long' in filtered.columns:
-    mheat = filtered[['merch_lat','merch_long','is_fraud']].dropna()
-    if not mheat.empty:
-        layers.append(pdk.Layer("HeatmapLayer", data=mheat, get_position=['merch_long','merch_lat'], aggregation='SUM', get_weight='is_fraud + 1e-6'))
-
-if "Customer scatter" in map_options and 'lat' in filtered.columns and 'long' in filtered.columns:
-    scatter_c = filtered[['lat','long','is_fraud','amt','city']].dropna()
-    if not scatter_c.empty:
+if "Customer heatmap" in map_options and not customer_cells.empty:
+    layers.append(pdk.Layer("HeatmapLayer", data=customer_cells, get_position=['long','lat'], aggregation='SUM', get_weight='frauds + 1e-6 * count'))
+
+if "Merchant heatmap" in map_options and not merchant_cells.empty:
+    layers.append(pdk.Layer("HeatmapLayer", data=merchant_cells, get_position=['long','lat'], aggregation='SUM', get_weight='frauds + 1e-6 * count'))
+
+if "Customer scatter" in map_options:
+    if raw_points:
+        scatter_c = points[['lat','long','is_fraud','amt','city']].dropna()
         layers.append(pdk.Layer("ScatterplotLayer", data=scatter_c, get_position=['long','lat'], get_fill_color='[255*is_fraud,140,30]', get_radius=200, pickable=True, auto_highlight=True))
+    elif not customer_cells.empty:
+        layers.append(pdk.Layer("ScatterplotLayer", data=customer_cells, get_position=['long','lat'], get_fill_color='[255*Math.min(1, 20*fraud_rate),140,30]', get_radius='radius', pickable=True, auto_highlight=True))
 
-if "Merchant scatter" in map_options and 'merch_lat' in filtered.columns and 'merch_long' in filtered.columns:
-    scatter_m = filtered[['merch_lat','merch_long','is_fraud','amt','merchant']].dropna()
-    if not scatter_m.empty:
+if "Merchant scatter" in map_options:
+    if raw_points:
+        scatter_m = points[['merch_lat','merch_long','is_fraud','amt','merchant']].dropna()
         layers.append(pdk.Layer("ScatterplotLayer", data=scatter_m, get_position=['merch_long','merch_lat'], get_fill_color='[30,144,255*(1-is_fraud)]', get_radius=250, pickable=True, auto_highlight=True))
+    elif not merchant_cells.empty:
+        layers.append(pdk.Layer("ScatterplotLayer", data=merchant_cells, get_position=['long','lat'], get_fill_color='[30,144,255*(1-Math.min(1, 20*fraud_rate))]', get_radius='radius', pickable=True, auto_highlight=True))
 
 if layers:
-    r = pdk.Deck(layers=layers, initial_view_state=initial_view_state, tooltip={"text":"{city}\nAmount: {amt}\nFraud: {is_fraud}"})
+    if raw_points:
+        tooltip = {"text":"{city}\nAmount: {amt}\nFraud: {is_fraud}"}
+    else:
+        tooltip = {"text":"Transactions: {count}\nFrauds: {frauds}\nFraud rate: {fraud_rate}"}
+    r = pdk.Deck(layers=layers, initial_view_state=initial_view_state, tooltip=tooltip)
     st.pydeck_chart(r)
+    if not raw_points:
+        st.caption(f"{len(positions):,} transactions binned into {len(customer_cells):,} customer and {len(merchant_cells):,} merchant cells.")
 else:
     st.info("No geospatial layers could be created (missing lat/long columns).")
 
 st.subheader("Temporal patterns")
-if 'trans_dt' in filtered.columns:
-    filtered['hour'] = filtered['trans_dt'].dt.hour
-    filtered['weekday'] = filtered['trans_dt'].dt.day_name()
+if 'trans_dt' in df.columns:
     col1, col2 = st.columns(2)
     with col1:
-        fig_h = px.histogram(filtered, x='hour', color='is_fraud', nbins=24, barmode='group', title='Transactions by Hour')
+        by_hour = hour_counts(index.hour[positions].astype(np.int64), sel_fraud)
+        fig_h = px.bar(by_hour, x='hour', y='count', color='is_fraud', barmode='group', title='Transactions by Hour')
         st.plotly_chart(fig_h, use_container_width=True)
     with col2:
-        wd_order = ['Monday','Tuesday','Wednesday','Thursday','Friday','Saturday','Sunday']
-        fig_w = px.histogram(filtered, x='weekday', category_orders={'weekday':wd_order}, color='is_fraud', title='Transactions by Weekday')
+        by_weekday = selected.by_weekday()
+        fig_w = px.bar(by_weekday.astype({'is_fraud': str}), x='weekday', y='count', color='is_fraud', title='Transactions by Weekday')
         st.plotly_chart(fig_w, use_container_width=True)
 else:
     st.info("No transaction datetime available.")
@@ -1,53 +1,116 @@
 import os
-import shutil
+from pathlib import Path
 import kagglehub
+import pyarrow as pa
 from creditfraud.entity.config_entity import DataIngestionConfig
 from creditfraud.logging.logger import logging
+from creditfraud.utils.common import load_json, save_json
+from creditfraud.utils.dataset import arrow_column_types
+from creditfraud.utils.partitioned import copy_verified, file_checksum, is_partitioned, write_partitioned
+from creditfraud.utils.instrumentation import instrumented
 
 
 class DataIngestion:
     def __init__(self, config: DataIngestionConfig):
         self.config = config
 
-    def download_file(self):
-        target_dir = self.config.local_data_file   
-
-
-        if os.path.exists(target_dir):
-            logging.info(f"Dataset already exists at {target_dir}. Skipping download.")
-            return
+    def source_dir(self) -> Path:
+        # A local directory stands in for the Kaggle dataset, e.g. in tests
+        if os.path.isdir(self.config.source_URL):
+            logging.info(f"Using local dataset directory: {self.config.source_URL}")
+            return Path(self.config.source_URL)
 
         logging.info(f"Downloading dataset from Kaggle: {self.config.source_URL}")
-        
-        # Download dataset through KaggleHub
         kaggle_path = kagglehub.dataset_download(self.config.source_URL)
         logging.info(f"Dataset downloaded to temporary directory: {kaggle_path}")
+        return Path(kaggle_path)
+
+    def source_signature(self, source_dir: Path) -> dict:
+        # Name, size and mtime of each source CSV; enough to notice new or replaced files
+        return {
+            p.name: [p.stat().st_size, p.stat().st_mtime_ns]
+            for p in sorted(source_dir.iterdir()) if p.suffix == ".csv"
+        }
+
+    def local_source_changed(self) -> bool:
+        """True if source_URL is a local directory whose CSVs differ from the last copy."""
+        if not os.path.isdir(self.config.source_URL):
+            return False
+        recorded = Path(self.config.root_dir) / "source_signature.json"
+        if not recorded.exists():
+            return True
+        return dict(load_json(recorded)) != self.source_signature(Path(self.config.source_URL))
+
+    @instrumented()
+    def download_file(self):
+        target_dir = Path(self.config.local_data_file)
 
-        # Copy dataset folder into artifacts
-        shutil.copytree(kaggle_path, target_dir)
-        logging.info(f"Dataset successfully copied to: {target_dir}")
-
-        self.rename_to_fraud_test()
-
-    def rename_to_fraud_test(self):
-        data_dir = self.config.local_data_file
-
-        if not os.path.exists(data_dir):
-            logging.warning(f"Data directory not found: {data_dir}")
+        if self.local_source_changed():
+            logging.info(f"Local source {self.config.source_URL} changed since the last copy. Refreshing raw data.")
+            self.copy_raw(self.source_dir())
+            self.build_dataset()
             return
 
-        csv_files = [f for f in os.listdir(data_dir) if f.endswith(".csv")]
-
-        if not csv_files:
-            logging.warning(f"No CSV files found in {data_dir}. Cannot rename.")
+        if is_partitioned(self.config.dataset_dir):
+            logging.info(f"Dataset already exists at {self.config.dataset_dir}. Skipping download.")
             return
 
-        original_path = os.path.join(data_dir, csv_files[0])
-        new_path = os.path.join(data_dir, "fraud_test.csv")
-
-        if os.path.exists(new_path):
-            os.remove(new_path)
-
-        os.rename(original_path, new_path)
-        logging.info(f"Renamed {csv_files[0]} → fraud_test.csv")
-
+        if target_dir.exists() and self.raw_files():
+            logging.info(f"Raw data already exists at {target_dir}. Skipping download.")
+        else:
+            self.copy_raw(self.source_dir())
+
+        self.build_dataset()
+
+    @instrumented()
+    def copy_raw(self, source_dir: Path) -> dict:
+        """
+        Copies the source CSVs into local_data_file, verified by checksum.
+
+        The first CSV becomes fraud_test.csv, as downstream readers expect.
+        Each file is written under a temporary name and renamed once its
+        checksum matches, so an interrupted copy never leaves a truncated CSV.
+        CSVs left from an earlier copy that are no longer in the source are
+        removed.
+        """
+        target_dir = Path(self.config.local_data_file)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        csv_files = sorted(p for p in source_dir.iterdir() if p.suffix == ".csv")
+        if not csv_files:
+            raise FileNotFoundError(f"No CSV files found in {source_dir}")
+
+        checksums = {}
+        for i, source in enumerate(csv_files):
+            target = target_dir / ("fraud_test.csv" if i == 0 else source.name)
+            checksum = copy_verified(source, target)
+            if checksum != file_checksum(source):
+                raise IOError(f"Source {source} changed while it was copied")
+            checksums[target.name] = checksum
+            logging.info(f"Copied {source.name} → {target} (sha256 {checksum[:12]})")
+
+        for stale in target_dir.iterdir():
+            if stale.suffix == ".csv" and stale.name not in checksums:
+                stale.unlink()
+                logging.info(f"Removed {stale}, no longer in the source")
+
+        save_json(Path(self.config.root_dir) / "raw_checksums.json", checksums)
+        save_json(Path(self.config.root_dir) / "source_signature.json", self.source_signature(source_dir))
+        return checksums
+
+    def raw_files(self) -> list:
+        target_dir = Path(self.config.local_data_file)
+        csv_files = sorted(p for p in target_dir.iterdir() if p.suffix == ".csv")
+        # fraud_test.csv first, so rows keep the order of the original source
+        return sorted(csv_files, key=lambda p: p.name != "fraud_test.csv")
+
+    @instrumented(rows_out="rows")
+    def build_dataset(self) -> dict:
+        try:
+            column_types = arrow_column_types(self.config.all_schema)
+            manifest = write_partitioned(self.raw_files(), self.config.dataset_dir, column_types, self.config.partition_by_state)
+        except pa.ArrowInvalid as e:
+            # Type problems are for validation to report; keep the types Arrow infers
+            logging.info(f"Raw data does not parse with schema types, partitioning with inferred types: {e}")
+            manifest = write_partitioned(self.raw_files(), self.config.dataset_dir, partition_by_state=self.config.partition_by_state)
+        logging.info(f"Dataset partitioned by {manifest['partition_by']} into {len(manifest['files'])} files")
+        return manifest
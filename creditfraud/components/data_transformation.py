@@ -1,8 +1,12 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 from pathlib import Path
-from sklearn.model_selection import train_test_split
 from creditfraud.entity.config_entity import DataTransformationConfig
 from creditfraud.logging.logger import logging
+from creditfraud.utils.common import save_split_artifacts, SPLIT_INDEX_FILE
+from creditfraud.utils.dataset import load_dataset, arrow_column_types, iter_record_batches, ParquetChunkWriter
+from creditfraud.utils.instrumentation import add_rows, instrumented
 
 class DataTransformation:
     def __init__(self, config: DataTransformationConfig):
@@ -12,52 +16,129 @@ class DataTransformation:
     def apply_transformations(self, df: pd.DataFrame) -> pd.DataFrame:
         logging.info("Starting transformation...")
 
-        df = df.copy()
-
-        # Rename variables
-        if "Unnamed: 0" in df.columns:
-            df = df.rename(columns={"Unnamed: 0": "id"})
+        # Rename variables (returns a new frame, the caller's frame is left untouched)
+        df = df.rename(columns={"Unnamed: 0": "id"})
 
         # Remove fraud_ prefix
         df["merchant"] = df["merchant"].str.replace("fraud_", "", regex=False)
 
-        # Split date & time
-        df[["trans_date", "trans_time"]] = df["trans_date_trans_time"].str.split(" ", expand=True)
-        df = df.drop(columns=["trans_date_trans_time"])
+        # Split date & time ("YYYY-MM-DD HH:MM:SS") without materialising a split frame
+        trans_dt = df.pop("trans_date_trans_time")
+        df["trans_date"] = trans_dt.str.slice(0, 10)
+        df["trans_time"] = trans_dt.str.slice(11)
+
+        return self.apply_schema_dtypes(df)
+
+    def apply_schema_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Type columns from schema.yaml: categoricals, datetimes and narrow ints
+        for col, dtype in self.config.all_schema.items():
+            if col not in df.columns or dtype == "string":
+                continue
+            if dtype == "datetime":
+                df[col] = pd.to_datetime(df[col])
+            else:
+                df[col] = df[col].astype(dtype)
 
         return df
 
     def split_and_save(self, df: pd.DataFrame):
         logging.info("Starting train-test split...")
 
-        train, test = train_test_split(
-            df,
-            test_size=self.config.test_size,
-            random_state=42,
-            stratify=df["is_fraud"]
-        )
-
-        # Paths
-        cleaned_path = self.config.root_dir / "cleaned.csv"
-        train_path = self.config.root_dir / "train.csv"
-        test_path = self.config.root_dir / "test.csv"
-
-        # Save all CSVs
-        df.to_csv(cleaned_path, index=False)
-        train.to_csv(train_path, index=False)
-        test.to_csv(test_path, index=False)
-
-        logging.info(f"Saved cleaned dataset: {cleaned_path}")
-        logging.info(f"Saved train dataset: {train_path}")
-        logging.info(f"Saved test dataset: {test_path}")
-
-        return df, train, test
+        # Same hash assignment as the streaming path, so both produce the same split
+        is_test = self.hash_split(df)
+        train_idx, test_idx = np.flatnonzero(~is_test), np.flatnonzero(is_test)
 
+        # Train and test are row positions into the one cleaned table
+        self.saved_paths = save_split_artifacts(
+            self.config.root_dir, df, train_idx, test_idx, self.config.artifact_format
+        )
+        for path in self.saved_paths:
+            logging.info(f"Saved transformation artifact: {path}")
+
+        return df, df.iloc[train_idx], df.iloc[test_idx]
+
+    def hash_split(self, df: pd.DataFrame) -> np.ndarray:
+        # Deterministic test assignment from trans_num: independent of chunking and row order,
+        # and applied within each is_fraud class so the split stays stratified in expectation
+        hashes = pd.util.hash_pandas_object(df[["trans_num", "is_fraud"]], index=False).to_numpy()
+        return (hashes >> np.uint64(11)) / float(2 ** 53) < self.config.test_size
+
+    @instrumented(rows_out="clean_rows")
+    def run_streaming_transformation(self) -> dict:
+        logging.info(f"Streaming data in chunks of {self.config.chunksize} rows...")
+
+        root_dir = self.config.root_dir
+        parquet = self.config.artifact_format == "parquet"
+        writer = ParquetChunkWriter(root_dir / "cleaned.parquet") if parquet else None
+        train_parts, test_parts = [], []
+        summary = {"clean_rows": 0, "train_rows": 0, "test_rows": 0, "train_frauds": 0, "test_frauds": 0}
+
+        if parquet:
+            self.saved_paths = [root_dir / "cleaned.parquet", root_dir / SPLIT_INDEX_FILE]
+        else:
+            self.saved_paths = [root_dir / "cleaned.csv", root_dir / "train.csv", root_dir / "test.csv"]
+
+        batches = iter_record_batches(
+            self.config.data_path, self.config.chunksize,
+            arrow_column_types(self.config.all_schema), filters=self.config.filters,
+        )
+        for batch in batches:
+            chunk = batch.to_pandas()
+            add_rows(rows_in=len(chunk))
+            df = self.apply_transformations(chunk)
+            is_test = self.hash_split(df)
+            offset = summary["clean_rows"]
+
+            if parquet:
+                writer.write(pa.Table.from_pandas(df, preserve_index=False))
+                positions = np.arange(offset, offset + len(df), dtype=np.uint32)
+                train_parts.append(positions[~is_test])
+                test_parts.append(positions[is_test])
+            else:
+                header = offset == 0
+                mode = "w" if header else "a"
+                df.to_csv(self.saved_paths[0], mode=mode, header=header, index=False)
+                df[~is_test].to_csv(self.saved_paths[1], mode=mode, header=header, index=False)
+                df[is_test].to_csv(self.saved_paths[2], mode=mode, header=header, index=False)
+
+            fraud = df["is_fraud"].to_numpy() == 1
+            summary["clean_rows"] += len(df)
+            summary["test_rows"] += int(is_test.sum())
+            summary["train_rows"] += int((~is_test).sum())
+            summary["test_frauds"] += int((fraud & is_test).sum())
+            summary["train_frauds"] += int((fraud & ~is_test).sum())
+            logging.info(f"Processed {summary['clean_rows']} rows")
+
+        if parquet:
+            writer.close()
+            np.savez_compressed(
+                self.saved_paths[1],
+                train=np.concatenate(train_parts) if train_parts else np.empty(0, dtype=np.uint32),
+                test=np.concatenate(test_parts) if test_parts else np.empty(0, dtype=np.uint32),
+            )
+
+        for path in self.saved_paths:
+            logging.info(f"Saved transformation artifact: {path}")
+
+        return self.summarize(summary)
+
+    @staticmethod
+    def summarize(counts: dict) -> dict:
+        return {
+            "clean_rows": counts["clean_rows"],
+            "train_rows": counts["train_rows"],
+            "test_rows": counts["test_rows"],
+            "fraud_rate_train": counts["train_frauds"] / max(counts["train_rows"], 1),
+            "fraud_rate_test": counts["test_frauds"] / max(counts["test_rows"], 1),
+        }
+
+    @instrumented(rows_out=lambda splits: len(splits[0]))
     def run_transformation(self):
         logging.info("Loading data...")
 
-        df = pd.read_csv(self.config.data_path)
+        df = load_dataset(self.config.data_path, arrow_column_types(self.config.all_schema), filters=self.config.filters).to_pandas()
         logging.info(f"Raw data shape: {df.shape}")
+        add_rows(rows_in=len(df))
 
         # Apply transformations
         df_clean = self.apply_transformations(df)
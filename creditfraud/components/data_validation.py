@@ -1,34 +1,154 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 from creditfraud.entity.config_entity import DataValidationConfig
 from creditfraud.logging.logger import logging
+from creditfraud.utils.common import save_json
+from creditfraud.utils.dataset import load_dataset, arrow_column_types, dataset_columns, iter_record_batches
+from creditfraud.utils.partitioned import is_partitioned
+from creditfraud.utils.instrumentation import add_rows, instrumented
 
 
 class DataValidation:
     def __init__(self, config: DataValidationConfig):
         self.config = config
+        self.columns = dict(self.config.all_schema.columns)
+        self.ranges = dict(self.config.all_schema.get("ranges", {}))
+        self.max_null_rate = self.config.all_schema.get("max_null_rate", 0.0)
 
+        # Derived columns only exist after transformation
+        derived = set(self.config.all_schema.get("derived_columns", []))
+        self.expected = {col: dtype for col, dtype in self.columns.items() if col not in derived}
+
+    def validate_header(self) -> dict:
+        # Header line only for a CSV, the manifest for a partitioned dataset
+        header = dataset_columns(self.config.data_path)
+
+        # "Unnamed: N" is the unnamed index column written by pandas
+        unexpected = [col for col in header if col not in self.columns and not col.startswith("Unnamed:")]
+        missing = [col for col in self.expected if col not in header]
+
+        for col in unexpected:
+            logging.info(f"Column {col} is not in schema.")
+        for col in missing:
+            logging.info(f"Column {col} from schema is missing in the data.")
+
+        return {
+            "columns": header,
+            "missing": missing,
+            "unexpected": unexpected,
+            "valid": not missing and not unexpected,
+        }
+
+    def iter_chunks(self, columns: list):
+        if is_partitioned(self.config.data_path):
+            # Partitions keep the types ingestion could parse; stream them as they are
+            batches = iter_record_batches(self.config.data_path, self.config.chunksize, columns=columns)
+            return (batch.to_pandas() for batch in batches)
+
+        # Parsing into the shared dataset also serves EDA and transformation;
+        # a file Arrow cannot type is re-read with pandas for a detailed report
+        try:
+            dataset = load_dataset(self.config.data_path, arrow_column_types(self.columns))
+        except pa.ArrowInvalid as e:
+            logging.info(f"Data does not parse with schema types, validating with pandas: {e}")
+            return pd.read_csv(self.config.data_path, usecols=columns, chunksize=self.config.chunksize)
+        return dataset.iter_batches(self.config.chunksize, columns=columns)
+
+    def check_chunk(self, chunk: pd.DataFrame, stats: dict):
+        for col, dtype in self.expected.items():
+            if col not in chunk.columns:
+                continue
+            series = chunk[col]
+            col_stats = stats[col]
+            present = series.notna()
+
+            col_stats["rows"] += len(series)
+            col_stats["nulls"] += int(len(series) - present.sum())
+
+            if dtype.startswith("int") or dtype.startswith("float"):
+                values = pd.to_numeric(series, errors="coerce")
+                bad = present & values.isna()
+                if dtype.startswith("int"):
+                    info = np.iinfo(dtype)
+                    bad |= values.notna() & ((values % 1 != 0) | (values < info.min) | (values > info.max))
+            elif dtype == "datetime":
+                values = pd.to_datetime(series, errors="coerce", format="ISO8601")
+                bad = present & values.isna()
+            else:
+                continue
+
+            col_stats["type_errors"] += int(bad.sum())
+            valid_values = values[~bad].dropna()
+            if valid_values.empty:
+                continue
+
+            low, high = valid_values.min(), valid_values.max()
+            col_stats["min"] = low if col_stats["min"] is None else min(col_stats["min"], low)
+            col_stats["max"] = high if col_stats["max"] is None else max(col_stats["max"], high)
+
+            if col in self.ranges:
+                range_min, range_max = self.ranges[col]
+                out_of_range = np.zeros(len(valid_values), dtype=bool)
+                if range_min is not None:
+                    out_of_range |= (valid_values < range_min).to_numpy()
+                if range_max is not None:
+                    out_of_range |= (valid_values > range_max).to_numpy()
+                col_stats["range_violations"] += int(out_of_range.sum())
+
+    def build_report(self, header: dict, stats: dict) -> dict:
+        columns = {}
+        for col, col_stats in stats.items():
+            rows = col_stats["rows"]
+            null_rate = col_stats["nulls"] / rows if rows else 0.0
+            columns[col] = {
+                "expected_type": self.expected[col],
+                "rows": rows,
+                "nulls": col_stats["nulls"],
+                "null_rate": null_rate,
+                "type_errors": col_stats["type_errors"],
+                "range_violations": col_stats["range_violations"],
+                "min": None if col_stats["min"] is None else str(col_stats["min"]),
+                "max": None if col_stats["max"] is None else str(col_stats["max"]),
+                "valid": (
+                    col not in header["missing"]
+                    and col_stats["type_errors"] == 0
+                    and col_stats["range_violations"] == 0
+                    and null_rate <= self.max_null_rate
+                ),
+            }
+
+        return {
+            "data_path": str(self.config.data_path),
+            "header": header,
+            "columns": columns,
+            "valid": header["valid"] and all(c["valid"] for c in columns.values()),
+        }
+
+    @instrumented()
     def validate_all_columns(self) -> bool:
         try:
-            validation_status = None
-            
-            data = pd.read_csv(self.config.data_path)
-            all_cols = list(data.columns)
-            all_types = list(data.dtypes)
-            
-            all_schema = self.config.all_schema.keys()
-            all_schema_types = self.config.all_schema.values()
-            
-            for col in all_cols:
-                for type_ in all_types:
-                    if col not in all_schema and type_ not in all_schema_types:
-                        validation_status = False
-                        logging.info(f"Column {col} with type {type_} is not in schema.")
-                        with open(self.config.STATUS_FILE, 'w') as file:
-                            file.write(f"Validation status: {validation_status}\n")
-                else:
-                    validation_status = True
-                    with open(self.config.STATUS_FILE, 'w') as file:
-                        file.write(f"Validation status: {validation_status}\n")
+            header = self.validate_header()
+            stats = {
+                col: {"rows": 0, "nulls": 0, "type_errors": 0, "range_violations": 0, "min": None, "max": None}
+                for col in self.expected
+            }
+
+            present = [col for col in self.expected if col in header["columns"]]
+            for chunk in self.iter_chunks(present):
+                self.check_chunk(chunk, stats)
+                add_rows(rows_in=len(chunk))
+
+            report = self.build_report(header, stats)
+            validation_status = report["valid"]
+            for col, col_report in report["columns"].items():
+                if not col_report["valid"]:
+                    logging.info(f"Column {col} failed validation: {col_report}")
+
+            save_json(self.config.report_file, report)
+            with open(self.config.STATUS_FILE, 'w') as file:
+                file.write(f"Validation status: {validation_status}\n")
+
             return validation_status
         except Exception as e:
-            raise e
\ No newline at end of file
+            raise e
@@ -1,38 +1,190 @@
+import numpy as np
 import pandas as pd
-import mlflow
+import pyarrow as pa
+import pyarrow.compute as pc
+from concurrent.futures import ThreadPoolExecutor
+from creditfraud.entity.config_entity import EDAConfig
+from creditfraud.logging.logger import logging
+from creditfraud.utils.common import save_json
+from creditfraud.utils.dataset import arrow_column_types, iter_record_batches
+from creditfraud.utils.sketches import HyperLogLog, QuantileSketch
+from creditfraud.utils.instrumentation import add_rows, instrumented
+
+TARGET_COLUMN = "is_fraud"
+QUANTILES = [0.25, 0.5, 0.75]
+
+
+class ColumnProfile:
+    """
+    Single-pass statistics of one column, updated chunk by chunk.
+
+    Mean and variance are merged per chunk with the parallel form of
+    Welford's update (Chan et al.), so they stay exact and numerically
+    stable; distinct counts and quantiles come from mergeable sketches.
+    """
+
+    def __init__(self, name: str, numeric: bool):
+        self.name = name
+        self.numeric = numeric
+        self.rows = 0
+        self.nulls = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.distinct = HyperLogLog()
+        self.quantiles = QuantileSketch() if numeric else None
+
+    def update(self, column: pa.Array):
+        self.rows += len(column)
+        self.nulls += column.null_count
+        present = column.drop_null() if column.null_count else column
+        if not len(present):
+            return
+
+        bounds = pc.min_max(present)
+        low, high = bounds["min"].as_py(), bounds["max"].as_py()
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+        # Distinct counts only need each value once; unique() is a C++ hash pass
+        self.distinct.add(pc.unique(present))
+        if not self.numeric:
+            self.count += len(present)
+            return
+
+        values = present.to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+        n = len(values)
+        mean = float(values.mean())
+        m2 = float(np.square(values - mean).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.quantiles.add(values)
+
+    def summary(self) -> dict:
+        summary = {
+            "count": self.count,
+            "nulls": self.nulls,
+            "null_rate": self.nulls / self.rows if self.rows else 0.0,
+            "distinct": round(self.distinct.estimate()),
+            "min": self.min,
+            "max": self.max,
+        }
+        if self.numeric:
+            summary["mean"] = self.mean if self.count else np.nan
+            summary["std"] = float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+            for q, value in zip(QUANTILES, self.quantiles.quantiles(QUANTILES)):
+                summary[f"{int(q * 100)}%"] = float(value)
+        return summary
+
+
+class FraudRates:
+    """Transactions and frauds per value of one categorical column, summed over chunks."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.parts = []
+
+    def update(self, column: pa.Array, is_fraud: pa.Array):
+        grouped = pa.table({"value": column, "is_fraud": is_fraud}).group_by("value").aggregate(
+            [("is_fraud", "count"), ("is_fraud", "sum")]
+        )
+        self.parts.append(grouped.to_pandas())
+
+    def summary(self) -> pd.DataFrame:
+        if not self.parts:
+            return pd.DataFrame(columns=["column", "value", "transactions", "frauds", "fraud_rate"])
+        rates = (
+            pd.concat(self.parts)
+            .groupby("value", dropna=False)[["is_fraud_count", "is_fraud_sum"]].sum()
+            .rename(columns={"is_fraud_count": "transactions", "is_fraud_sum": "frauds"})
+            .reset_index()
+        )
+        rates["fraud_rate"] = rates["frauds"] / rates["transactions"]
+        rates.insert(0, "column", self.name)
+        return rates.sort_values("fraud_rate", ascending=False, ignore_index=True)
+
 
 class FraudEDA:
-    def __init__(self, df: pd.DataFrame):
-        self.df = df
-        mlflow.set_experiment("fraud_detection")
+    def __init__(self, config: EDAConfig):
+        self.config = config
+        # Schema "category" columns get a fraud-rate breakdown
+        self.category_columns = [col for col, dtype in self.config.all_schema.items() if dtype == "category"]
+
+    @instrumented(rows_out="rows")
+    def run_eda(self) -> dict:
+        """
+        Profiles every column in one chunked pass over the data.
+
+        Each chunk is read once; the per-column updates for it run in a
+        thread pool (Arrow and NumPy kernels release the GIL), and the next
+        chunk is read only after they finish, so memory stays at one chunk.
 
-    def run_eda(self):
-        with mlflow.start_run(run_name="eda_run"):
+        Returns:
+            dict: Dataset-level metrics; tables are written to root_dir.
+        """
+        logging.info(f"Profiling {self.config.data_path} in chunks of {self.config.chunksize} rows...")
+        profiles, rates = None, []
+        batches = iter_record_batches(
+            self.config.data_path, self.config.chunksize,
+            arrow_column_types(self.config.all_schema), filters=self.config.filters,
+        )
 
-            # Log basic dataset shape
-            mlflow.log_metric("rows", self.df.shape[0])
-            mlflow.log_metric("columns", self.df.shape[1])
+        with ThreadPoolExecutor(max_workers=self.config.max_workers or None) as pool:
+            for batch in batches:
+                if profiles is None:
+                    # "Unnamed: N" is the unnamed index column written by pandas
+                    profiles = [
+                        ColumnProfile(field.name, pa.types.is_integer(field.type) or pa.types.is_floating(field.type))
+                        for field in batch.schema if not field.name.startswith("Unnamed:")
+                    ]
+                    rates = [FraudRates(col) for col in self.category_columns if col in batch.schema.names]
 
-            # Missing values
-            total_missing = self.df.isnull().sum().sum()
-            mlflow.log_metric("total_missing_values", total_missing)
+                tasks = [pool.submit(p.update, batch.column(p.name)) for p in profiles]
+                tasks += [pool.submit(r.update, batch.column(r.name), batch.column(TARGET_COLUMN)) for r in rates]
+                for task in tasks:
+                    task.result()
+                add_rows(rows_in=batch.num_rows)
 
-            # Fraud stats
-            fraud_count = (self.df["is_fraud"] == 1).sum()
-            mlflow.log_metric("fraud_count", fraud_count)
-            mlflow.log_metric("fraud_percentage", fraud_count / len(self.df) * 100)
+        if profiles is None:
+            raise ValueError(f"No rows to profile in {self.config.data_path}")
+        return self.save_results(profiles, rates)
 
-            # Merchant stats
-            mlflow.log_metric("unique_merchants", self.df["merchant"].nunique())
+    @instrumented()
+    def save_results(self, profiles: list, rates: list) -> dict:
+        root_dir = self.config.root_dir
+        summaries = {p.name: p.summary() for p in profiles}
+        describe = pd.DataFrame(summaries)
+        describe.to_csv(root_dir / "eda_describe.csv")
+        describe.loc["nulls"].rename("missing").to_csv(root_dir / "eda_missing.csv")
+        fraud_rates = pd.concat([r.summary() for r in rates], ignore_index=True) if rates else pd.DataFrame()
+        fraud_rates.to_csv(root_dir / "eda_fraud_rates.csv", index=False)
 
-            # Save descriptive statistics as an artifact
-            describe_path = "eda_describe.csv"
-            self.df.describe().to_csv(describe_path)
-            mlflow.log_artifact(describe_path)
+        rows = profiles[0].rows
+        target = summaries.get(TARGET_COLUMN, {})
+        fraud_count = target.get("mean", 0.0) * target.get("count", 0)
+        metrics = {
+            "rows": rows,
+            "columns": len(profiles),
+            "total_missing_values": sum(p.nulls for p in profiles),
+            "fraud_count": round(fraud_count),
+            "fraud_percentage": 100 * fraud_count / rows if rows else 0.0,
+        }
+        if "merchant" in summaries:
+            metrics["unique_merchants"] = summaries["merchant"]["distinct"]
+        if "cc_num" in summaries:
+            metrics["unique_cards"] = summaries["cc_num"]["distinct"]
 
-            # Save missing value breakdown
-            missing_path = "eda_missing.csv"
-            self.df.isnull().sum().to_csv(missing_path)
-            mlflow.log_artifact(missing_path)
+        # Per-column metrics, named <column>_<statistic>
+        for name, summary in summaries.items():
+            for stat in ["nulls", "distinct", "mean", "std"]:
+                if stat in summary and np.isfinite(summary[stat]):
+                    metrics[f"{name}_{stat}"] = float(summary[stat])
 
-            print("\nEDA tracking complete. Saved to MLflow.")
+        save_json(root_dir / "eda_summary.json", metrics)
+        logging.info(f"EDA profiled {rows} rows and {len(profiles)} columns; results in {root_dir}")
+        return metrics
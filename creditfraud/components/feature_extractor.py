@@ -0,0 +1,124 @@
+import shutil
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from creditfraud.entity.config_entity import FeatureExtractorConfig
+from creditfraud.logging.logger import logging
+from creditfraud.components.velocity_features import VelocityFeatures
+from creditfraud.utils.common import SPLIT_INDEX_FILE
+from creditfraud.utils.dataset import ParquetChunkWriter
+from creditfraud.utils.instrumentation import instrumented
+
+EARTH_RADIUS_KM = 6371.0088
+SECONDS_PER_YEAR = 365.2425 * 86400
+
+# Columns the features are computed from
+INPUT_COLUMNS = ["cc_num", "dob", "unix_time", "amt", "city_pop", "lat", "long", "merch_lat", "merch_long"]
+HISTORY_COLUMNS = ["cc_num", "unix_time", "amt"]
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=np.float64)) for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class FeatureExtractor:
+    def __init__(self, config: FeatureExtractorConfig):
+        self.config = config
+        self.config.root_dir.mkdir(parents=True, exist_ok=True)
+        self.city_pop_bins = np.asarray(self.config.city_pop_bins, dtype=np.float64)
+        self.velocity = VelocityFeatures(self.config.velocity_windows)
+
+    def feature_arrays(self, columns: dict) -> dict:
+        """
+        Computes the features from NumPy input columns, with dob as seconds since the epoch.
+
+        Whole-column NumPy arithmetic only, no per-row Python and no pandas,
+        so the scoring server can call it directly.
+        """
+        unix_time = np.asarray(columns["unix_time"], dtype=np.int64)
+        amt = np.asarray(columns["amt"], dtype=np.float64)
+        city_pop = np.asarray(columns["city_pop"], dtype=np.float64)
+
+        days = unix_time // 86400
+        months = unix_time.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+
+        return {
+            "age": ((unix_time - columns["dob"]) / SECONDS_PER_YEAR).astype(np.float32),
+            "distance_km": haversine_km(
+                columns["lat"], columns["long"], columns["merch_lat"], columns["merch_long"]
+            ).astype(np.float32),
+            "hour": ((unix_time % 86400) // 3600).astype(np.int8),
+            # 1970-01-01 was a Thursday; Monday=0
+            "weekday": ((days + 3) % 7).astype(np.int8),
+            "month": (months % 12 + 1).astype(np.int8),
+            "log_amt": np.log1p(amt).astype(np.float32),
+            "city_pop_bucket": (np.searchsorted(self.city_pop_bins, city_pop, side="right") - 1).astype(np.int8),
+        }
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        columns = {name: df[name].to_numpy() for name in INPUT_COLUMNS if name != "dob"}
+        columns["dob"] = pd.to_datetime(df["dob"]).to_numpy().astype("datetime64[s]").astype(np.int64)
+        return pd.DataFrame(self.feature_arrays(columns), index=df.index)
+
+    def transform_with_history(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.transform(df).join(self.velocity.transform(df))
+
+    @instrumented()
+    def fit_history(self, history: pd.DataFrame):
+        # Velocity history is the train split only, see VelocityFeatures
+        self.velocity.fit(history["cc_num"], history["unix_time"], history["amt"])
+        logging.info(f"Velocity history fitted on {len(history)} train rows")
+
+    @instrumented(rows_out=lambda rows: rows)
+    def extract_parquet(self) -> int:
+        rows = 0
+        source_path = self.config.data_dir / "cleaned.parquet"
+        with np.load(self.config.data_dir / SPLIT_INDEX_FILE) as index:
+            train_rows = index["train"]
+        self.fit_history(pq.read_table(source_path, columns=HISTORY_COLUMNS).take(train_rows).to_pandas())
+
+        source = pq.ParquetFile(source_path)
+        with ParquetChunkWriter(self.config.root_dir / "cleaned.parquet") as writer:
+            for batch in source.iter_batches(batch_size=self.config.chunksize):
+                features = self.transform_with_history(batch.select(INPUT_COLUMNS).to_pandas())
+                table = pa.Table.from_batches([batch]).replace_schema_metadata(None)
+                for col in features.columns:
+                    table = table.append_column(col, pa.array(features[col].to_numpy()))
+                writer.write(table)
+                rows += len(features)
+
+        # Feature rows line up with the cleaned rows, so the split index is shared
+        shutil.copy(self.config.data_dir / SPLIT_INDEX_FILE, self.config.root_dir / SPLIT_INDEX_FILE)
+        return rows
+
+    @instrumented(rows_out=lambda rows: rows)
+    def extract_csv(self) -> int:
+        rows = 0
+        self.fit_history(pd.read_csv(self.config.data_dir / "train.csv", usecols=HISTORY_COLUMNS))
+
+        for split in ["train", "test"]:
+            target = self.config.root_dir / f"{split}.csv"
+            for i, chunk in enumerate(pd.read_csv(self.config.data_dir / f"{split}.csv", chunksize=self.config.chunksize)):
+                chunk = chunk.join(self.transform_with_history(chunk))
+                chunk.to_csv(target, mode="w" if i == 0 else "a", header=i == 0, index=False)
+                rows += len(chunk)
+        return rows
+
+    @instrumented(rows_out="feature_rows")
+    def run_feature_extraction(self) -> dict:
+        logging.info("Starting feature extraction...")
+
+        start = time.perf_counter()
+        if self.config.artifact_format == "parquet":
+            rows = self.extract_parquet()
+        else:
+            rows = self.extract_csv()
+        elapsed = time.perf_counter() - start
+
+        summary = {"feature_rows": rows, "feature_seconds": elapsed, "rows_per_second": rows / max(elapsed, 1e-9)}
+        logging.info(f"Extracted features for {rows} rows in {elapsed:.2f}s ({summary['rows_per_second']:,.0f} rows/s)")
+        return summary
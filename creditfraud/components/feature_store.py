@@ -0,0 +1,198 @@
+import os
+from collections import OrderedDict
+import numpy as np
+from creditfraud.entity.config_entity import FeatureStoreConfig
+from creditfraud.logging.logger import logging
+
+# Marks an unused ring buffer slot; never inside any window
+EMPTY_TIME = np.iinfo(np.int64).min // 2
+# Most idle cards evicted by one insert; each card is evicted once, so the cost is amortized O(1)
+EVICTION_SWEEP = 8
+
+
+class CardStateStore:
+    """
+    In-memory per-card state for online velocity features.
+
+    Each card owns one slot in a set of preallocated arrays: a fixed-size
+    ring buffer of recent unix_time/amt values plus running totals. Update
+    and query touch one slot, so both are O(buffer_size) = O(1) per
+    transaction, and memory is bounded by max_cards * buffer_size.
+
+    features() returns the same columns as VelocityFeatures, computed from
+    the history seen before the transaction. Window counts saturate at
+    buffer_size, and the running mean covers every transaction the card
+    has seen since it entered the store.
+
+    Cards are kept in least recently updated order. Every new card first
+    evicts a few cards idle for ttl_seconds from the front of that order;
+    when the store is full and none is idle, the least recently updated
+    card makes room.
+    """
+
+    def __init__(self, config: FeatureStoreConfig, initial_capacity: int = 1024):
+        self.config = config
+        self.windows = {name: int(seconds) for name, seconds in self.config.velocity_windows.items()}
+        self.max_window = max(self.windows.values())
+        self.count_names = [f"tx_count_{name}" for name in self.windows]
+        self.window_seconds = np.array(list(self.windows.values()), dtype=np.int64)
+        self.slots = OrderedDict()
+        self._allocate(min(initial_capacity, self.config.max_cards))
+
+    def _allocate(self, capacity: int):
+        size = self.config.buffer_size
+        self.times = np.full((capacity, size), EMPTY_TIME, dtype=np.int64)
+        self.amts = np.zeros((capacity, size), dtype=np.float32)
+        self.heads = np.zeros(capacity, dtype=np.int32)
+        self.amt_sums = np.zeros(capacity, dtype=np.float64)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.last_seen = np.zeros(capacity, dtype=np.int64)
+        self.card_ids = np.zeros(capacity, dtype=np.int64)
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def _grow(self):
+        old = len(self.heads)
+        capacity = min(old * 2, self.config.max_cards)
+        for name in ["times", "amts", "heads", "amt_sums", "counts", "last_seen", "card_ids"]:
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            if name == "times":
+                grown.fill(EMPTY_TIME)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self.free.extend(range(capacity - 1, old - 1, -1))
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def features(self, cc_num: int, unix_time: int, amt: float, pending: list = ()) -> dict:
+        """
+        Velocity features of a transaction from the card's history, without changing it.
+
+        pending lists (unix_time, amt) of the card's earlier transactions
+        that have not been added yet, oldest first. They count as if update
+        had been called for each, so a batch can be featurized before its
+        transactions are added.
+        """
+        slot = self.slots.get(cc_num)
+        known = slot is not None and self.counts[slot] > 0
+        if not known and not pending:
+            features = dict.fromkeys(self.count_names, 0)
+            features["amt_to_card_mean"] = 1.0
+            features["seconds_since_prev"] = self.max_window
+            return features
+
+        times = self.times[slot] if known else np.empty(0, dtype=np.int64)
+        count = int(self.counts[slot]) if known else 0
+        amt_sum = float(self.amt_sums[slot]) if known else 0.0
+        if pending:
+            # Ring buffer oldest first, then the pending transactions, cut to the buffer size
+            if known:
+                times = np.roll(times, -int(self.heads[slot]))
+            times = np.concatenate([times, np.array([t for t, _ in pending], dtype=np.int64)])[-self.config.buffer_size:]
+            count += len(pending)
+            amt_sum += sum(a for _, a in pending)
+
+        # Unused and not-yet-earlier slots become EMPTY_TIME, then all windows are counted at once
+        earlier = np.where(times < unix_time, times, EMPTY_TIME)
+        counts = (earlier >= unix_time - self.window_seconds[:, None]).sum(axis=1).tolist()
+        features = dict(zip(self.count_names, counts))
+
+        mean = amt_sum / count
+        features["amt_to_card_mean"] = float(amt / mean) if mean > 0 else 1.0
+        since = unix_time - int(earlier.max())
+        features["seconds_since_prev"] = min(since, self.max_window)
+        return features
+
+    def update(self, cc_num: int, unix_time: int, amt: float):
+        slot = self.slots.get(cc_num)
+        if slot is None:
+            slot = self._insert(cc_num, unix_time)
+        else:
+            self.slots.move_to_end(cc_num)
+
+        head = self.heads[slot]
+        self.times[slot, head] = unix_time
+        self.amts[slot, head] = amt
+        self.heads[slot] = (head + 1) % self.config.buffer_size
+        self.amt_sums[slot] += amt
+        self.counts[slot] += 1
+        if unix_time > self.last_seen[slot]:
+            self.last_seen[slot] = unix_time
+
+    def observe(self, cc_num: int, unix_time: int, amt: float) -> dict:
+        """Returns the features of a transaction, then adds it to the card's state."""
+        features = self.features(cc_num, unix_time, amt)
+        self.update(cc_num, unix_time, amt)
+        return features
+
+    def _insert(self, cc_num: int, unix_time: int) -> int:
+        self.evict_idle(unix_time, limit=EVICTION_SWEEP)
+        if not self.free:
+            if len(self.heads) < self.config.max_cards:
+                self._grow()
+            else:
+                # Full and nothing idle: drop the least recently updated card
+                self._release([next(iter(self.slots.values()))])
+
+        slot = self.free.pop()
+        self.slots[cc_num] = slot
+        self.card_ids[slot] = cc_num
+        self.last_seen[slot] = unix_time
+        return slot
+
+    def _release(self, slots: np.ndarray):
+        for slot in slots:
+            del self.slots[int(self.card_ids[slot])]
+        self.times[slots] = EMPTY_TIME
+        self.amts[slots] = 0
+        self.heads[slots] = 0
+        self.amt_sums[slots] = 0
+        self.counts[slots] = 0
+        self.last_seen[slots] = 0
+        self.free.extend(int(slot) for slot in slots)
+
+    def evict_idle(self, now: int, limit: int = None) -> int:
+        """
+        Drops cards not seen for ttl_seconds and returns how many were evicted.
+
+        Cards are checked from the least recently updated one and the sweep
+        stops at the first active card, or after limit evictions.
+        """
+        cutoff = now - self.config.ttl_seconds
+        idle = []
+        for slot in self.slots.values():
+            if self.last_seen[slot] >= cutoff or (limit is not None and len(idle) >= limit):
+                break
+            idle.append(slot)
+        if idle:
+            self._release(idle)
+            if limit is None:
+                logging.info(f"Evicted {len(idle)} idle cards from the feature store")
+        return len(idle)
+
+    def snapshot(self, path=None):
+        path = path or self.config.snapshot_path
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            times=self.times, amts=self.amts, heads=self.heads, amt_sums=self.amt_sums,
+            counts=self.counts, last_seen=self.last_seen, card_ids=self.card_ids,
+            active=np.fromiter(self.slots.values(), dtype=np.int64),
+        )
+        os.replace(tmp_path, path)
+        logging.info(f"Feature store snapshot with {len(self)} cards saved at {path}")
+
+    def restore(self, path=None):
+        path = path or self.config.snapshot_path
+        with np.load(path) as snapshot:
+            if snapshot["times"].shape[1] != self.config.buffer_size:
+                raise ValueError(f"Snapshot buffer size {snapshot['times'].shape[1]} does not match config")
+            for name in ["times", "amts", "heads", "amt_sums", "counts", "last_seen", "card_ids"]:
+                setattr(self, name, snapshot[name].copy())
+            active = snapshot["active"]
+
+        self.slots = OrderedDict((int(card), int(slot)) for card, slot in zip(self.card_ids[active], active))
+        used = set(self.slots.values())
+        self.free = [slot for slot in range(len(self.heads) - 1, -1, -1) if slot not in used]
+        logging.info(f"Feature store restored with {len(self)} cards from {path}")
@@ -0,0 +1,111 @@
+import math
+from pathlib import Path
+import numpy as np
+from creditfraud.utils.common import save_bin, load_bin
+
+# Plain arrays only: the serving process loads this module without sklearn or mlflow
+
+
+def export_linear_scorer(path, numeric_features: list, mean: np.ndarray, scale: np.ndarray,
+                         coef: np.ndarray, intercept: float, categories: dict):
+    """
+    Writes a fitted linear model as plain arrays for LinearScorer.
+
+    coef holds the numeric weights followed by one weight per category value,
+    in the order of categories. Standardisation is folded into the numeric
+    weights and the bias, so scoring is a single dot product.
+    """
+    numeric_coef = coef[:len(numeric_features)]
+    weights = numeric_coef / scale
+    arrays = {
+        "numeric_features": np.array(numeric_features, dtype=str),
+        "mean": mean.astype(np.float64),
+        "scale": scale.astype(np.float64),
+        "weights": weights.astype(np.float64),
+        "bias": np.array(float(intercept) - float(np.dot(mean, weights))),
+        "categorical_features": np.array(list(categories), dtype=str),
+    }
+    offset = len(numeric_features)
+    for feature, values in categories.items():
+        arrays[f"values__{feature}"] = np.array(values, dtype=str)
+        arrays[f"coef__{feature}"] = coef[offset:offset + len(values)].astype(np.float64)
+        offset += len(values)
+
+    save_bin(Path(path), arrays)
+
+
+def sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+class LinearScorer:
+    """
+    Fused standardise-dot-sigmoid scorer for an exported linear model.
+
+    Category values map to integer codes; unknown values get code -1, which
+    points at a trailing zero weight, matching the all-zero one-hot row of
+    the trained model.
+    """
+
+    def __init__(self, arrays: dict, max_batch_size: int = 1024):
+        self.numeric_features = arrays["numeric_features"].tolist()
+        self.categorical_features = arrays["categorical_features"].tolist()
+        self.weights = np.ascontiguousarray(arrays["weights"])
+        self.bias = float(arrays["bias"])
+        self.codes = {}
+        self.category_weights = {}
+        for feature in self.categorical_features:
+            values = arrays[f"values__{feature}"].tolist()
+            self.codes[feature] = {value: code for code, value in enumerate(values)}
+            self.category_weights[feature] = np.append(arrays[f"coef__{feature}"], 0.0)
+        # Per-value weights as plain floats for the single-row path
+        self.value_weights = {
+            feature: dict(zip(self.codes[feature], self.category_weights[feature][:-1].tolist()))
+            for feature in self.categorical_features
+        }
+
+        self.row = np.empty(len(self.numeric_features))
+        self.logits = np.empty(max_batch_size)
+
+    @classmethod
+    def load(cls, path, max_batch_size: int = 1024, mmap_mode: str = "r") -> "LinearScorer":
+        # Memory-mapped weights are shared by every worker process on the host
+        return cls(load_bin(Path(path), mmap_mode=mmap_mode), max_batch_size)
+
+    def encode(self, feature: str, values) -> np.ndarray:
+        codes = self.codes[feature]
+        return np.fromiter((codes.get(value, -1) for value in values), dtype=np.int64, count=len(values))
+
+    def score_one(self, numeric, categories: dict) -> float:
+        self.row[:] = numeric
+        z = self.bias + float(self.weights.dot(self.row))
+        for feature, value in categories.items():
+            z += self.value_weights[feature].get(value, 0.0)
+        return sigmoid(z)
+
+    def score(self, numeric: np.ndarray, codes: dict) -> np.ndarray:
+        """
+        Scores a (rows, numeric features) matrix plus one code array per categorical feature.
+
+        The probabilities are a view of a buffer reused by the next call;
+        copy them (e.g. with tolist()) to keep them.
+        """
+        n = len(numeric)
+        if n > len(self.logits):
+            # Grown once, so larger batches stop allocating after the first
+            self.logits = np.empty(n)
+        logits = self.logits[:n]
+        np.dot(numeric, self.weights, out=logits)
+        logits += self.bias
+        for feature in self.categorical_features:
+            logits += self.category_weights[feature][codes[feature]]
+
+        # 1 / (1 + exp(-z)), in place; exp overflow for very negative z gives probability 0
+        with np.errstate(over="ignore"):
+            np.negative(logits, out=logits)
+            np.exp(logits, out=logits)
+        logits += 1.0
+        return np.reciprocal(logits, out=logits)
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+from creditfraud.entity.config_entity import ModelEvaluationConfig
+from creditfraud.logging.logger import logging
+from creditfraud.utils.common import iter_split, load_bin
+from creditfraud.utils.instrumentation import instrumented
+
+# Upper bound on resamples x segments held in memory by one bootstrap batch
+BOOTSTRAP_BATCH_CELLS = 1 << 24
+
+
+def threshold_groups(y_true: np.ndarray, scores: np.ndarray) -> tuple:
+    """
+    Sorts the scores once, descending, and collapses tied scores.
+
+    Returns the distinct thresholds and the positive and negative count at
+    each threshold.
+    """
+    order = np.argsort(-scores, kind="stable")
+    sorted_scores = scores[order]
+    starts = np.flatnonzero(np.r_[True, sorted_scores[1:] != sorted_scores[:-1]])
+    y_sorted = y_true[order].astype(np.int64)
+    positives = np.add.reduceat(y_sorted, starts)
+    negatives = np.diff(np.r_[starts, len(scores)]) - positives
+    return sorted_scores[starts], positives, negatives
+
+
+def curve_metrics(positives: np.ndarray, negatives: np.ndarray) -> tuple:
+    """
+    ROC AUC and average precision from per-threshold counts, in descending threshold order.
+
+    Works on the last axis, so a (resamples, thresholds) matrix of counts scores
+    every resample at once.
+    """
+    tps = np.cumsum(positives, axis=-1)
+    fps = np.cumsum(negatives, axis=-1)
+    total_pos = tps[..., -1:]
+    total_neg = fps[..., -1:]
+
+    # Mann-Whitney: each positive beats the negatives scored below it, ties count half
+    negatives_below = total_neg - fps
+    roc_auc = (positives * (negatives_below + 0.5 * negatives)).sum(axis=-1) / (total_pos * total_neg)[..., 0]
+
+    precision = tps / np.maximum(tps + fps, 1)
+    average_precision = (positives * precision).sum(axis=-1) / total_pos[..., 0]
+    return roc_auc, average_precision
+
+
+class ModelEvaluation:
+    def __init__(self, config: ModelEvaluationConfig):
+        self.config = config
+        self.config.root_dir.mkdir(parents=True, exist_ok=True)
+
+    @instrumented(rows_out=lambda result: len(result[0]))
+    def score_test_split(self) -> tuple:
+        model = load_bin(self.config.model_path)
+        columns = model.numeric_features + list(model.categories) + [self.config.target_column]
+
+        scores, labels = [], []
+        for chunk in iter_split(self.config.data_dir, "test", self.config.artifact_format, self.config.chunksize, columns):
+            scores.append(model.predict_proba(chunk)[:, 1])
+            labels.append(chunk[self.config.target_column].to_numpy(dtype=np.int8))
+        return np.concatenate(scores), np.concatenate(labels)
+
+    def threshold_sweep(self, thresholds: np.ndarray, positives: np.ndarray, negatives: np.ndarray) -> pd.DataFrame:
+        # Predicting fraud when score >= threshold
+        tp = np.cumsum(positives)
+        fp = np.cumsum(negatives)
+        fn = tp[-1] - tp
+        tn = fp[-1] - fp
+        precision = tp / np.maximum(tp + fp, 1)
+        recall = tp / max(tp[-1], 1)
+        cost = self.config.false_positive_cost * fp + self.config.false_negative_cost * fn
+        return pd.DataFrame({
+            "threshold": thresholds,
+            "tp": tp, "fp": fp, "fn": fn, "tn": tn,
+            "precision": precision,
+            "recall": recall,
+            "fpr": fp / max(fp[-1], 1),
+            "f1": 2 * precision * recall / np.maximum(precision + recall, 1e-12),
+            "cost": cost,
+            "cost_per_transaction": cost / (tp[-1] + fp[-1]),
+        })
+
+    @instrumented()
+    def bootstrap(self, positives: np.ndarray, negatives: np.ndarray, best_index: int) -> dict:
+        """
+        Stratified bootstrap of ROC AUC, PR AUC and cost at the chosen threshold.
+
+        Works on the tie groups of the single sort, so no resample is ever
+        re-sorted. Runs of groups without frauds are merged into one segment,
+        which leaves every metric unchanged and shrinks the problem to about
+        one segment per fraud. Frauds are resampled as a batched index matrix.
+        Legitimate rows are resampled as multinomial counts over the segments,
+        which has the same distribution as drawing their indices.
+        """
+        has_positives = positives > 0
+        boundary = has_positives | np.r_[False, has_positives[:-1]]
+        boundary[0] = True
+        if best_index + 1 < len(boundary):
+            boundary[best_index + 1] = True
+        segment = np.cumsum(boundary) - 1
+        n_segments = int(segment[-1]) + 1
+
+        positive_segments = np.repeat(segment, positives)
+        negative_share = np.bincount(segment, weights=negatives, minlength=n_segments)
+        total_neg = int(negative_share.sum())
+        negative_share /= total_neg
+        flagged = np.arange(n_segments) <= segment[best_index]
+        n = len(positive_segments) + total_neg
+
+        rng = np.random.default_rng(42)
+        batch = max(1, BOOTSTRAP_BATCH_CELLS // n_segments)
+        draws = {"roc_auc": [], "pr_auc": [], "cost_per_transaction": []}
+        for done in range(0, self.config.n_bootstrap, batch):
+            size = min(batch, self.config.n_bootstrap - done)
+            offsets = (np.arange(size) * n_segments)[:, None]
+            idx = rng.integers(0, len(positive_segments), (size, len(positive_segments)))
+            cells = (positive_segments[idx] + offsets).ravel()
+            resampled_pos = np.bincount(cells, minlength=size * n_segments).reshape(size, n_segments)
+            resampled_neg = rng.multinomial(total_neg, negative_share, size=size)
+
+            roc_auc, pr_auc = curve_metrics(resampled_pos, resampled_neg)
+            fp = resampled_neg[:, flagged].sum(axis=1)
+            fn = resampled_pos[:, ~flagged].sum(axis=1)
+            cost = (self.config.false_positive_cost * fp + self.config.false_negative_cost * fn) / n
+
+            draws["roc_auc"].append(roc_auc)
+            draws["pr_auc"].append(pr_auc)
+            draws["cost_per_transaction"].append(cost)
+
+        tail = (1 - self.config.confidence_level) / 2 * 100
+        return {
+            name: np.percentile(np.concatenate(values), [tail, 100 - tail]).tolist()
+            for name, values in draws.items()
+        }
+
+    @instrumented(rows_out="test_rows")
+    def evaluate(self) -> dict:
+        scores, y_true = self.score_test_split()
+        if y_true.min() == y_true.max():
+            raise ValueError("Test data needs both classes to evaluate the model")
+        logging.info(f"Scored {len(scores)} test rows, {int(y_true.sum())} frauds")
+
+        thresholds, positives, negatives = threshold_groups(y_true, scores)
+        roc_auc, pr_auc = curve_metrics(positives, negatives)
+
+        sweep = self.threshold_sweep(thresholds, positives, negatives)
+        sweep.to_parquet(self.config.curve_file, index=False)
+
+        best_index = int(sweep["cost"].to_numpy().argmin())
+        best = sweep.iloc[best_index]
+        intervals = self.bootstrap(positives, negatives, best_index)
+
+        metrics = {
+            "test_rows": int(len(scores)),
+            "test_frauds": int(y_true.sum()),
+            "roc_auc": float(roc_auc),
+            "pr_auc": float(pr_auc),
+            "best_threshold": float(best["threshold"]),
+            "precision_at_best": float(best["precision"]),
+            "recall_at_best": float(best["recall"]),
+            "cost_per_transaction": float(best["cost_per_transaction"]),
+            "max_f1": float(sweep["f1"].max()),
+            "confidence_level": self.config.confidence_level,
+            "n_bootstrap": self.config.n_bootstrap,
+            "confidence_intervals": intervals,
+        }
+        logging.info(f"Evaluation metrics: {metrics}")
+        return metrics
@@ -0,0 +1,153 @@
+import os
+import warnings
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import roc_auc_score, average_precision_score
+from sklearn.preprocessing import StandardScaler
+from creditfraud.components.model_trainer import FraudModel
+from creditfraud.entity.config_entity import ModelSearchConfig
+from creditfraud.logging.logger import logging
+from creditfraud.utils.common import iter_split
+from creditfraud.utils.instrumentation import instrumented
+
+# Arrays attached by each worker process, see _attach_shared
+_SHARED = {}
+
+
+def _attach_shared(specs: dict, n_train: int):
+    for name, (shm_name, shape, dtype) in specs.items():
+        # Workers share the parent's resource tracker, so attaching adds no extra registration
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _SHARED[f"{name}_shm"] = shm
+        _SHARED[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    _SHARED["n_train"] = n_train
+
+
+def _search_path(l1_ratio: float, subset: str, columns: list, alphas: list, max_iter: int) -> list:
+    """Walks the alpha path from strongest to weakest, warm-starting each fit from the previous one."""
+    X, y, n_train = _SHARED["X"], _SHARED["y"], _SHARED["n_train"]
+    # Rows are shuffled with the training rows first, so both splits are views of the
+    # shared matrix; only a feature subset needs its own copy of the columns
+    if columns != list(range(X.shape[1])):
+        X = X[:, columns]
+    X_train, y_train = X[:n_train], y[:n_train]
+    X_val, y_val = X[n_train:], y[n_train:]
+
+    counts = np.bincount(y_train, minlength=2)
+    weights = (len(y_train) / (2.0 * counts))[y_train]
+
+    classifier = SGDClassifier(
+        loss="log_loss", penalty="elasticnet", l1_ratio=l1_ratio,
+        max_iter=max_iter, warm_start=True, random_state=42,
+    )
+    results = []
+    for alpha in sorted(alphas, reverse=True):
+        classifier.set_params(alpha=alpha)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            classifier.fit(X_train, y_train, sample_weight=weights)
+
+        scores = classifier.decision_function(X_val)
+        results.append({
+            "subset": subset,
+            "l1_ratio": l1_ratio,
+            "alpha": alpha,
+            "roc_auc": float(roc_auc_score(y_val, scores)),
+            "pr_auc": float(average_precision_score(y_val, scores)),
+            "n_iter": int(classifier.n_iter_),
+            "nonzero_coefficients": int(np.count_nonzero(classifier.coef_)),
+        })
+    return results
+
+
+class ModelSearch:
+    def __init__(self, config: ModelSearchConfig):
+        self.config = config
+        self.trainer = config.trainer
+        self.config.root_dir.mkdir(parents=True, exist_ok=True)
+
+    @instrumented(rows_out=len)
+    def sample(self) -> pd.DataFrame:
+        # Bottom-k on random keys: a uniform sample of max_rows without knowing the total
+        columns = self.trainer.numeric_features + self.trainer.categorical_features + [self.trainer.target_column]
+        rng = np.random.default_rng(42)
+        kept = None
+        for chunk in iter_split(self.trainer.data_dir, "train", self.trainer.artifact_format, self.trainer.chunksize, columns):
+            chunk = chunk.assign(_key=rng.random(len(chunk)))
+            kept = chunk if kept is None else pd.concat([kept, chunk], ignore_index=True)
+            if len(kept) > self.config.max_rows:
+                kept = kept.nsmallest(self.config.max_rows, "_key")
+        return kept.drop(columns="_key").reset_index(drop=True)
+
+    def design(self, sample: pd.DataFrame) -> tuple:
+        """
+        Builds the shared design matrix, with the training rows first.
+
+        Rows are shuffled once and the first n_train become the training
+        split. The scaler and the category vocabulary are fitted on those
+        rows only, so validation scores see no validation statistics.
+
+        Returns:
+            tuple: X, y, feature subsets (name to column indices) and n_train.
+        """
+        sample = sample.iloc[np.random.default_rng(42).permutation(len(sample))].reset_index(drop=True)
+        n_train = len(sample) - int(round(self.config.validation_size * len(sample)))
+        train = sample.iloc[:n_train]
+
+        # The matrix is scaled once here and shared by every worker
+        scaler = StandardScaler().fit(train[self.trainer.numeric_features].to_numpy(dtype=np.float64))
+        categories = {
+            feature: sorted(train[feature].dropna().astype(str).unique())
+            for feature in self.trainer.categorical_features
+        }
+        model = FraudModel(self.trainer.numeric_features, categories, scaler, classifier=None)
+        X = np.ascontiguousarray(model.design_matrix(sample))
+        y = sample[self.trainer.target_column].to_numpy(dtype=np.int64)
+
+        names = model.feature_names
+        subsets = {"all": list(range(len(names)))}
+        for subset, features in self.config.feature_subsets.items():
+            subsets[subset] = [
+                i for i, name in enumerate(names)
+                if name in features or name.split("=", 1)[0] in features
+            ]
+        return X, y, subsets, n_train
+
+    @instrumented(rows_out="rows")
+    def run_search(self) -> dict:
+        logging.info("Sampling training data for the search...")
+        X, y, subsets, n_train = self.design(self.sample())
+        logging.info(f"Search matrix {X.shape}, {len(subsets)} feature subsets, {len(self.config.l1_ratios)} l1 ratios")
+
+        blocks, specs = [], {}
+        try:
+            for name, array in [("X", X), ("y", y)]:
+                shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+                blocks.append(shm)
+                specs[name] = (shm.name, array.shape, array.dtype.str)
+            del X
+
+            n_jobs = os.cpu_count() if self.config.n_jobs == -1 else self.config.n_jobs
+            with ProcessPoolExecutor(
+                max_workers=n_jobs, initializer=_attach_shared, initargs=(specs, n_train)
+            ) as pool:
+                futures = [
+                    pool.submit(_search_path, l1_ratio, subset, columns, self.config.alphas, self.config.max_iter)
+                    for subset, columns in subsets.items()
+                    for l1_ratio in self.config.l1_ratios
+                ]
+                results = [row for future in futures for row in future.result()]
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+        best = max(results, key=lambda row: row["roc_auc"])
+        logging.info(f"Best configuration: {best}")
+        return {"rows": int(len(y)), "results": results, "best": best}
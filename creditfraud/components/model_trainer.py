@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from creditfraud.components.linear_scorer import export_linear_scorer
+from creditfraud.entity.config_entity import ModelTrainerConfig
+from creditfraud.logging.logger import logging
+from creditfraud.utils.common import iter_split, save_bin
+from creditfraud.utils.instrumentation import instrumented
+
+
+class FraudModel:
+    """
+    Standardised numeric features plus one-hot categoricals feeding a linear classifier.
+    """
+
+    def __init__(self, numeric_features: list, categories: dict, scaler: StandardScaler, classifier: SGDClassifier):
+        self.numeric_features = numeric_features
+        self.categories = categories
+        self.scaler = scaler
+        self.classifier = classifier
+
+    @property
+    def feature_names(self) -> list:
+        names = list(self.numeric_features)
+        for feature, values in self.categories.items():
+            names += [f"{feature}={value}" for value in values]
+        return names
+
+    def design_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        blocks = [self.scaler.transform(df[self.numeric_features].to_numpy(dtype=np.float64))]
+        for feature, values in self.categories.items():
+            # Unknown categories get an all-zero row
+            codes = pd.Categorical(df[feature], categories=values).codes
+            onehot = np.zeros((len(df), len(values)))
+            known = codes >= 0
+            onehot[np.flatnonzero(known), codes[known]] = 1.0
+            blocks.append(onehot)
+        return np.hstack(blocks)
+
+    def predict_proba(self, df: pd.DataFrame) -> np.ndarray:
+        return self.classifier.predict_proba(self.design_matrix(df))
+
+    def export_scorer(self, path):
+        """Dumps the model as NumPy arrays for the sklearn-free LinearScorer."""
+        export_linear_scorer(
+            path, self.numeric_features, self.scaler.mean_, self.scaler.scale_,
+            self.classifier.coef_[0], self.classifier.intercept_[0], self.categories,
+        )
+
+
+class ModelTrainer:
+    def __init__(self, config: ModelTrainerConfig):
+        self.config = config
+        self.config.root_dir.mkdir(parents=True, exist_ok=True)
+        self.columns = self.config.numeric_features + self.config.categorical_features + [self.config.target_column]
+
+    def iter_train(self):
+        return iter_split(
+            self.config.data_dir, "train", self.config.artifact_format, self.config.chunksize, self.columns
+        )
+
+    @instrumented()
+    def scan(self) -> tuple:
+        # First pass: scaler moments, class counts and category vocabularies
+        scaler = StandardScaler()
+        class_counts = np.zeros(2, dtype=np.int64)
+        categories = {feature: set() for feature in self.config.categorical_features}
+
+        for chunk in self.iter_train():
+            scaler.partial_fit(chunk[self.config.numeric_features].to_numpy(dtype=np.float64))
+            class_counts += np.bincount(chunk[self.config.target_column].to_numpy(dtype=np.int64), minlength=2)[:2]
+            for feature in categories:
+                categories[feature].update(chunk[feature].dropna().astype(str).unique())
+
+        categories = {feature: sorted(values) for feature, values in categories.items()}
+        return scaler, class_counts, categories
+
+    @instrumented(rows_out=lambda result: result[1]["train_rows"])
+    def train(self) -> tuple:
+        logging.info("Scanning training data...")
+        scaler, class_counts, categories = self.scan()
+        total = class_counts.sum()
+        if total == 0 or class_counts.min() == 0:
+            raise ValueError(f"Training data needs both classes, got counts {class_counts.tolist()}")
+
+        # Balanced weights: each class contributes half of the total weight
+        class_weights = total / (2.0 * class_counts)
+        logging.info(f"Class counts {class_counts.tolist()}, weights {class_weights.tolist()}")
+
+        classifier = SGDClassifier(
+            loss="log_loss",
+            penalty="elasticnet",
+            alpha=self.config.alpha,
+            l1_ratio=self.config.l1_ratio,
+            learning_rate="optimal",
+            random_state=42,
+        )
+        model = FraudModel(self.config.numeric_features, categories, scaler, classifier)
+
+        rng = np.random.default_rng(42)
+        for epoch in range(self.config.epochs):
+            for chunk in self.iter_train():
+                # Chunks follow file order; shuffle within each one
+                chunk = chunk.iloc[rng.permutation(len(chunk))]
+                y = chunk[self.config.target_column].to_numpy(dtype=np.int64)
+                classifier.partial_fit(
+                    model.design_matrix(chunk), y, classes=np.array([0, 1]), sample_weight=class_weights[y]
+                )
+            logging.info(f"Finished epoch {epoch + 1}/{self.config.epochs}")
+
+        model_path = self.config.root_dir / self.config.model_name
+        save_bin(model_path, model)
+        model.export_scorer(self.config.root_dir / self.config.scorer_name)
+        logging.info(f"NumPy scorer exported at {self.config.root_dir / self.config.scorer_name}")
+
+        summary = {
+            "train_rows": int(total),
+            "train_frauds": int(class_counts[1]),
+            "nonzero_coefficients": int(np.count_nonzero(classifier.coef_)),
+        }
+        return model, summary
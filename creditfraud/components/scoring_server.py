@@ -0,0 +1,264 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from creditfraud.components.feature_extractor import FeatureExtractor, INPUT_COLUMNS
+from creditfraud.components.feature_store import CardStateStore
+from creditfraud.components.linear_scorer import LinearScorer
+from creditfraud.entity.config_entity import ScoringServerConfig
+from creditfraud.logging.logger import logging
+from creditfraud.utils.artifact_watcher import ArtifactWatcher
+from creditfraud.utils.common import load_bin
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+MAX_BODY_BYTES = 1 << 20
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class MicroBatchScorer:
+    """
+    Coalesces concurrent single-transaction requests into micro-batches.
+
+    Requests wait on a queue until max_batch_size are pending or the oldest
+    has waited max_wait_ms. The batch then goes through the feature
+    extractor and the model in one vectorized call on a worker thread, so
+    the event loop keeps accepting requests while it is scored. Velocity
+    features come from the online card store, updated in arrival order.
+    """
+
+    def __init__(self, config: ScoringServerConfig):
+        self.config = config
+        # The NumPy export scores without sklearn; the joblib model is the fallback.
+        # Either is memory-mapped and swapped whole when its file is replaced.
+        self.use_scorer = config.scorer_path.exists()
+        if self.use_scorer:
+            self.artifact = ArtifactWatcher(
+                config.scorer_path,
+                lambda path: LinearScorer.load(path, config.max_batch_size, config.mmap_mode),
+                config.reload_interval,
+            )
+            feature_names = self.artifact.current.categorical_features
+            logging.info(f"Scoring with the NumPy scorer from {config.scorer_path}")
+        else:
+            self.artifact = ArtifactWatcher(
+                config.model_path, lambda path: load_bin(path, mmap_mode=config.mmap_mode), config.reload_interval
+            )
+            feature_names = list(self.artifact.current.categories)
+        self.extractor = FeatureExtractor(config.feature_extractor)
+        self.store = CardStateStore(config.feature_store)
+        if config.use_feature_store and config.feature_store.snapshot_path.exists():
+            self.store.restore()
+
+        self.categorical_features = feature_names
+        self.required = list(dict.fromkeys(INPUT_COLUMNS + self.categorical_features))
+        self.queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scorer")
+        self.stats = {"requests": 0, "batches": 0}
+
+    def validate(self, transaction: object) -> dict:
+        if not isinstance(transaction, dict):
+            raise HTTPError(400, "Expected a JSON object with one transaction")
+        missing = [name for name in self.required if name not in transaction]
+        if missing:
+            raise HTTPError(400, f"Missing fields: {', '.join(missing)}")
+        return transaction
+
+    async def score(self, transaction: dict) -> float:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((transaction, future))
+        return await future
+
+    def score_batch(self, transactions: list) -> np.ndarray:
+        columns = {name: [transaction[name] for transaction in transactions] for name in self.required}
+        # ISO dates parse straight into NumPy; anything else fails the batch and is scored alone
+        columns["dob"] = np.array(columns["dob"], dtype="datetime64[s]").astype(np.int64)
+        values = {**columns, **self.extractor.feature_arrays(columns)}
+
+        # Card state is read before each transaction is added, as in training. Earlier
+        # transactions of the same card in this batch count through pending; the store
+        # itself only changes once the whole batch has been scored.
+        cards = [
+            (int(cc_num), int(unix_time), float(amt))
+            for cc_num, unix_time, amt in zip(columns["cc_num"], columns["unix_time"], columns["amt"])
+        ]
+        pending = {}
+        velocity = []
+        for cc_num, unix_time, amt in cards:
+            velocity.append(self.store.features(cc_num, unix_time, amt, pending.get(cc_num, ())))
+            if self.config.use_feature_store:
+                pending.setdefault(cc_num, []).append((unix_time, amt))
+        values.update({name: [row[name] for row in velocity] for name in velocity[0]})
+
+        model = self.artifact.get()
+        if self.use_scorer:
+            numeric = np.empty((len(transactions), len(model.numeric_features)))
+            for j, name in enumerate(model.numeric_features):
+                numeric[:, j] = values[name]
+            codes = {feature: model.encode(feature, columns[feature]) for feature in model.categorical_features}
+            scores = model.score(numeric, codes)
+        else:
+            scores = model.predict_proba(pd.DataFrame(values))[:, 1]
+
+        if self.config.use_feature_store:
+            for cc_num, unix_time, amt in cards:
+                self.store.update(cc_num, unix_time, amt)
+        return scores
+
+    def score_each(self, transactions: list) -> list:
+        # Fallback after a failed batch: one bad transaction must not fail its neighbours
+        results = []
+        for transaction in transactions:
+            try:
+                results.append(float(self.score_batch([transaction])[0]))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        max_wait = self.config.max_wait_ms / 1000
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + max_wait
+            while len(batch) < self.config.max_batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            transactions = [transaction for transaction, _ in batch]
+            try:
+                results = (await loop.run_in_executor(self.executor, self.score_batch, transactions)).tolist()
+            except Exception as e:
+                logging.warning(f"Batch of {len(batch)} failed ({e}), scoring one by one")
+                results = await loop.run_in_executor(self.executor, self.score_each, transactions)
+
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(HTTPError(400, f"Could not score transaction: {result}"))
+                else:
+                    future.set_result(result)
+
+
+class ScoringServer:
+    """
+    Minimal asyncio HTTP/1.1 server with keep-alive.
+
+    POST /score takes one transaction as a JSON object and returns its fraud
+    probability. GET /health reports batching statistics.
+    """
+
+    def __init__(self, config: ScoringServerConfig):
+        self.config = config
+        self.scorer = MicroBatchScorer(config)
+
+    async def handle(self, method: str, path: str, body: bytes) -> tuple:
+        if path == "/health":
+            if method != "GET":
+                raise HTTPError(405, "Use GET")
+            stats = self.scorer.stats
+            return 200, {"status": "ok", **stats, "mean_batch_size": stats["requests"] / max(stats["batches"], 1)}
+        if path == "/score":
+            if method != "POST":
+                raise HTTPError(405, "Use POST")
+            try:
+                transaction = json.loads(body)
+            except ValueError:
+                raise HTTPError(400, "Body is not valid JSON")
+            start = time.perf_counter()
+            probability = await self.scorer.score(self.scorer.validate(transaction))
+            return 200, {
+                "fraud_probability": probability,
+                "latency_ms": (time.perf_counter() - start) * 1000,
+            }
+        raise HTTPError(404, f"No route for {path}")
+
+    async def connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, _ = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    status, payload = 400, {"error": "Bad Content-Length"}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 400, {"error": "Body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    try:
+                        status, payload = await self.handle(method, path.split("?", 1)[0], body)
+                    except HTTPError as e:
+                        status, payload = e.status, {"error": str(e)}
+                    except Exception as e:
+                        logging.exception(e)
+                        status, payload = 500, {"error": "Scoring failed"}
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        batcher = asyncio.create_task(self.scorer.run())
+        server = await asyncio.start_server(self.connection, self.config.host, self.config.port, backlog=1024)
+        logging.info(
+            f"Scoring server listening on http://{self.config.host}:{self.config.port} "
+            f"(max batch {self.config.max_batch_size}, max wait {self.config.max_wait_ms}ms)"
+        )
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self.scorer.executor.shutdown(wait=True)
+            if self.config.use_feature_store:
+                self.scorer.store.snapshot()
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+TIME_BITS = 32
+
+
+class VelocityFeatures:
+    """
+    Per-card behavioural features computed against a fixed transaction history.
+
+    fit() sorts the history once by (cc_num, unix_time) into a single int64 key
+    (card code in the high bits, time in the low bits) with a running sum of
+    amounts. transform() then answers every query with a few searchsorted calls
+    over that key, so windows and running means cost O(log n) per row with no
+    groupby.
+
+    Only history strictly earlier than a query's unix_time is used. Fitting on
+    the train split alone keeps the split leak-free: train rows never see test
+    rows, and test rows are scored against train history only, which is also
+    what the online feature store sees for a new transaction.
+
+    Rows with no earlier history get amt_to_card_mean = 1 and
+    seconds_since_prev equal to the largest window.
+    """
+
+    def __init__(self, windows: dict):
+        self.windows = {name: int(seconds) for name, seconds in windows.items()}
+        self.max_window = max(self.windows.values())
+
+    @property
+    def feature_names(self) -> list:
+        return [f"tx_count_{name}" for name in self.windows] + ["amt_to_card_mean", "seconds_since_prev"]
+
+    def fit(self, cc_num, unix_time, amt):
+        cc_num = np.asarray(cc_num, dtype=np.int64)
+        unix_time = np.asarray(unix_time, dtype=np.int64)
+
+        self.cards = np.unique(cc_num)
+        # Offset by the largest window so key - window never borrows from the card bits
+        self.time_origin = (unix_time.min() if len(unix_time) else 0) - self.max_window
+
+        keys = self._keys(np.searchsorted(self.cards, cc_num), unix_time)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.amt_cumsum = np.concatenate([[0.0], np.cumsum(np.asarray(amt, dtype=np.float64)[order])])
+        return self
+
+    def _keys(self, codes: np.ndarray, unix_time: np.ndarray) -> np.ndarray:
+        relative = np.clip(unix_time - self.time_origin, self.max_window, None)
+        if len(relative) and relative.max() >= 1 << TIME_BITS:
+            raise ValueError("unix_time span too large for velocity feature keys")
+        return (codes.astype(np.int64) << TIME_BITS) | relative
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        cc_num = df["cc_num"].to_numpy(dtype=np.int64)
+        unix_time = df["unix_time"].to_numpy(dtype=np.int64)
+        amt = df["amt"].to_numpy(dtype=np.float64)
+
+        codes = np.searchsorted(self.cards, cc_num)
+        known = codes < len(self.cards)
+        known[known] = self.cards[codes[known]] == cc_num[known]
+
+        query = self._keys(codes, unix_time)
+        card_start = np.searchsorted(self.keys, codes.astype(np.int64) << TIME_BITS, side="left")
+        before = np.searchsorted(self.keys, query, side="left")
+        prior = np.where(known, before - card_start, 0)
+
+        features = {}
+        for name, seconds in self.windows.items():
+            window_start = np.searchsorted(self.keys, query - seconds, side="left")
+            features[f"tx_count_{name}"] = np.where(known, before - window_start, 0).astype(np.int32)
+
+        has_prior = prior > 0
+        prior_sum = self.amt_cumsum[before] - self.amt_cumsum[card_start]
+        card_mean = np.divide(prior_sum, prior, out=np.zeros(len(prior)), where=has_prior)
+        features["amt_to_card_mean"] = np.divide(
+            amt, card_mean, out=np.ones(len(amt)), where=has_prior & (card_mean > 0)
+        ).astype(np.float32)
+
+        mask = (1 << TIME_BITS) - 1
+        previous = self.keys[np.maximum(before - 1, 0)] & mask if len(self.keys) else np.zeros(len(query), dtype=np.int64)
+        since = np.where(has_prior, (query & mask) - previous, self.max_window)
+        features["seconds_since_prev"] = np.minimum(since, self.max_window).astype(np.int32)
+
+        return pd.DataFrame(features, index=df.index)
@@ -2,7 +2,17 @@ from pathlib import Path
 from creditfraud.entity.config_entity import (
     DataIngestionConfig,
     DataValidationConfig,
-    DataTransformationConfig
+    EDAConfig,
+    DataTransformationConfig,
+    FeatureExtractorConfig,
+    FeatureStoreConfig,
+    ScoringServerConfig,
+    ModelTrainerConfig,
+    ModelSearchConfig,
+    ModelEvaluationConfig,
+    StageCacheConfig,
+    ArtifactStoreConfig,
+    InstrumentationConfig
 )
 from creditfraud.utils.common import read_yaml, create_directories
 from creditfraud.constants import *
@@ -20,6 +30,36 @@ class ConfigurationManager:
 
         create_directories([self.config.artifacts_root])
 
+    def get_stage_cache_config(self) -> StageCacheConfig:
+        config = self.config.stage_cache
+        create_directories([config.root_dir])
+
+        return StageCacheConfig(
+            root_dir=Path(config.root_dir),
+            enabled=config.enabled,
+            hash_inputs=config.hash_inputs,
+        )
+
+    def get_artifact_store_config(self) -> ArtifactStoreConfig:
+        config = self.config.artifact_store
+        create_directories([config.root_dir])
+
+        return ArtifactStoreConfig(
+            root_dir=Path(config.root_dir),
+        )
+
+    def get_instrumentation_config(self) -> InstrumentationConfig:
+        config = self.config.instrumentation
+
+        return InstrumentationConfig(
+            enabled=config.enabled,
+            trace_memory=config.trace_memory,
+            profile=config.profile,
+            profile_dir=Path(config.profile_dir),
+            log_to_mlflow=config.log_to_mlflow,
+            experiment_name=config.experiment_name,
+        )
+
     def get_data_ingestion_config(self) -> DataIngestionConfig:
         config = self.config.data_ingestion
         create_directories([config.root_dir])
@@ -28,6 +68,9 @@ class ConfigurationManager:
             root_dir=Path(config.root_dir),
             source_URL=config.source_URL,
             local_data_file=config.local_data_file,
+            dataset_dir=Path(config.dataset_dir),
+            partition_by_state=config.partition_by_state,
+            all_schema=self.schema.columns,
         )
 
     def get_data_validation_config(self) -> DataValidationConfig:
@@ -39,7 +82,22 @@ class ConfigurationManager:
             root_dir=Path(config.root_dir),
             STATUS_FILE=Path(config.status_file),
             data_path=Path(config.data_path),
-            all_schema=schema
+            all_schema=schema,
+            report_file=Path(config.report_file),
+            chunksize=config.chunksize
+        )
+
+    def get_eda_config(self) -> EDAConfig:
+        config = self.config.eda
+        create_directories([config.root_dir])
+
+        return EDAConfig(
+            root_dir=Path(config.root_dir),
+            data_path=Path(config.data_path),
+            all_schema=self.schema.columns,
+            filters=dict(config.get("filters") or {}),
+            chunksize=config.chunksize,
+            max_workers=config.max_workers,
         )
 
     def get_data_transformation_config(self) -> DataTransformationConfig:
@@ -48,5 +106,110 @@ class ConfigurationManager:
         return DataTransformationConfig(
             root_dir=Path(config["root_dir"]),
             data_path=Path(config["data_path"]),
-            test_size=config["test_size"]
+            test_size=config["test_size"],
+            artifact_format=config["artifact_format"],
+            all_schema=self.schema.columns,
+            chunksize=config["chunksize"],
+            filters=dict(config.get("filters") or {}),
+        )
+
+    def get_feature_extractor_config(self) -> FeatureExtractorConfig:
+        config = self.config.feature_extractor
+        create_directories([config.root_dir])
+
+        return FeatureExtractorConfig(
+            root_dir=Path(config.root_dir),
+            data_dir=Path(config.data_dir),
+            artifact_format=self.config.data_transformation.artifact_format,
+            chunksize=config.chunksize,
+            city_pop_bins=list(config.city_pop_bins),
+            velocity_windows=dict(config.velocity_windows),
+        )
+
+    def get_feature_store_config(self) -> FeatureStoreConfig:
+        config = self.config.feature_store
+        create_directories([config.root_dir])
+
+        return FeatureStoreConfig(
+            root_dir=Path(config.root_dir),
+            snapshot_path=Path(config.snapshot_path),
+            velocity_windows=dict(self.config.feature_extractor.velocity_windows),
+            buffer_size=config.buffer_size,
+            ttl_seconds=config.ttl_seconds,
+            max_cards=config.max_cards,
+        )
+
+    def get_scoring_server_config(self) -> ScoringServerConfig:
+        config = self.config.scoring_server
+
+        return ScoringServerConfig(
+            model_path=Path(config.model_path),
+            scorer_path=Path(config.scorer_path),
+            mmap_mode=config.mmap_mode,
+            reload_interval=config.reload_interval,
+            host=config.host,
+            port=config.port,
+            max_batch_size=config.max_batch_size,
+            max_wait_ms=config.max_wait_ms,
+            use_feature_store=config.use_feature_store,
+            feature_extractor=self.get_feature_extractor_config(),
+            feature_store=self.get_feature_store_config(),
+        )
+
+    def get_model_trainer_config(self) -> ModelTrainerConfig:
+        config = self.config.model_trainer
+        params = self.params.ElasticNet
+        create_directories([config.root_dir])
+
+        return ModelTrainerConfig(
+            root_dir=Path(config.root_dir),
+            data_dir=Path(config.data_dir),
+            artifact_format=self.config.data_transformation.artifact_format,
+            model_name=config.model_name,
+            scorer_name=config.scorer_name,
+            chunksize=config.chunksize,
+            numeric_features=list(config.numeric_features),
+            categorical_features=list(config.categorical_features),
+            target_column=self.schema.target_column,
+            alpha=params.alpha,
+            l1_ratio=params.l1_ratio,
+            epochs=params.epochs,
+        )
+
+    def get_model_search_config(self) -> ModelSearchConfig:
+        config = self.config.model_search
+        params = self.params.ModelSearch
+        create_directories([config.root_dir])
+
+        return ModelSearchConfig(
+            root_dir=Path(config.root_dir),
+            results_file=Path(config.results_file),
+            trainer=self.get_model_trainer_config(),
+            max_rows=config.max_rows,
+            validation_size=config.validation_size,
+            n_jobs=config.n_jobs,
+            alphas=list(params.alphas),
+            l1_ratios=list(params.l1_ratios),
+            max_iter=params.max_iter,
+            feature_subsets={name: list(features) for name, features in params.feature_subsets.items()},
+        )
+
+    def get_model_evaluation_config(self) -> ModelEvaluationConfig:
+        config = self.config.model_evaluation
+        params = self.params.Evaluation
+        create_directories([config.root_dir])
+
+        return ModelEvaluationConfig(
+            root_dir=Path(config.root_dir),
+            data_dir=Path(config.data_dir),
+            artifact_format=self.config.data_transformation.artifact_format,
+            model_path=Path(config.model_path),
+            metric_file_name=Path(config.metric_file_name),
+            curve_file=Path(config.curve_file),
+            chunksize=config.chunksize,
+            target_column=self.schema.target_column,
+            n_bootstrap=params.n_bootstrap,
+            confidence_level=params.confidence_level,
+            false_positive_cost=params.false_positive_cost,
+            false_negative_cost=params.false_negative_cost,
         )
@@ -2,4 +2,5 @@ from pathlib import Path
 
 CONFIG_FILE_PATH = Path("config/config.yaml")
 PARAMS_FILE_PATH = Path("params.yaml")
-SCHEMA_FILE_PATH = Path("schema.yaml")
\ No newline at end of file
+SCHEMA_FILE_PATH = Path("schema.yaml")
+DATASET_CACHE_DIR = Path("artifacts/dataset_cache")
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+from creditfraud.dashboard.distributions import QUANTILES
+from creditfraud.dashboard.sketches import CellSketches
+
+DIMENSIONS = ["day", "state", "category", "merchant", "is_fraud"]
+# Columns from_rows reads; cc_num is only needed for sketches
+ROW_COLUMNS = ["trans_dt", "state", "category", "merchant", "is_fraud", "amt"]
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class FraudCube:
+    """
+    Transactions pre-aggregated at day x state x category x merchant x is_fraud.
+
+    Each cell holds count, sum(amt) and sum(amt^2), which is enough for
+    counts, fraud rates, means and standard deviations of any roll-up.
+    Cells only exist for combinations that occur, so the number of distinct
+    merchants in a selection is the number of distinct merchant codes left.
+
+    With sketches, each cell also carries a CellSketches entry, so distinct
+    cards and amount quantiles of a selection come from merging sketches
+    instead of scanning rows.
+    """
+
+    def __init__(self, cells: pd.DataFrame, sketches: CellSketches = None):
+        self.cells = cells
+        self.sketches = sketches
+
+    @classmethod
+    def from_rows(cls, df: pd.DataFrame, sketches: bool = False) -> "FraudCube":
+        rows = pd.DataFrame({
+            "day": df["trans_dt"].dt.floor("D"),
+            "state": df["state"],
+            "category": df["category"],
+            "merchant": df["merchant"],
+            "is_fraud": df["is_fraud"].astype(np.int8),
+            "amt": df["amt"].astype(np.float64),
+            "amt_sq": df["amt"].astype(np.float64) ** 2,
+        })
+        rows = rows.dropna(subset=["day"])
+        # Sorted groups: cells come out ordered by day, and ngroup() is the cell position
+        groups = rows.groupby(DIMENSIONS, observed=True, sort=True)
+        cells = groups.agg(count=("amt", "size"), amt_sum=("amt", "sum"), amt_sumsq=("amt_sq", "sum")).reset_index()
+        for col in ["state", "category", "merchant"]:
+            cells[col] = cells[col].astype("category")
+        cells["count"] = cells["count"].astype(np.int32)
+
+        cell_sketches = None
+        if sketches:
+            kept = df.loc[rows.index]
+            cell_sketches = CellSketches(
+                groups.ngroup().to_numpy(), len(cells),
+                cards=kept["cc_num"].to_numpy(dtype=np.int64),
+                merchants=kept["merchant"].astype("category").cat.codes.to_numpy(dtype=np.int64),
+                amt=rows["amt"].to_numpy(),
+            )
+        return cls(cells, cell_sketches)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def select(self, start_date, end_date, states: list, merchants: list, fraud_mode: str) -> "FraudCube":
+        cells = self.cells
+        days = cells["day"].to_numpy()
+        # Cells are sorted by day, so the date range is a slice
+        lo, hi = np.searchsorted(days, [np.datetime64(start_date), np.datetime64(end_date) + np.timedelta64(1, "D")])
+        cells = cells.iloc[lo:hi]
+
+        mask = np.ones(len(cells), dtype=bool)
+        if states:
+            mask &= cells["state"].isin(states).to_numpy()
+        if merchants:
+            mask &= cells["merchant"].isin(merchants).to_numpy()
+        if fraud_mode == "Fraud only":
+            mask &= cells["is_fraud"].to_numpy() == 1
+        elif fraud_mode == "Non-fraud only":
+            mask &= cells["is_fraud"].to_numpy() == 0
+        return FraudCube(cells[mask], self.sketches)
+
+    def approximate_kpis(self) -> dict:
+        """Distinct counts and the median amount merged from the cell sketches."""
+        cells = self.cells.index.to_numpy()
+        return {
+            "unique_merchants": self.sketches.distinct("merchants", cells),
+            "unique_cards": self.sketches.distinct("cards", cells),
+            "median_amt": float(self.sketches.quantiles(cells, [0.5])[0]),
+        }
+
+    def approximate_amount_quantiles(self) -> pd.DataFrame:
+        """Same layout as distributions.amount_quantiles, from the cell sketches."""
+        is_fraud = self.cells["is_fraud"].to_numpy()
+        cells = self.cells.index.to_numpy()
+        rows = {label: self.sketches.quantiles(cells[is_fraud == label], QUANTILES) for label in (0, 1)}
+        return pd.DataFrame(rows, index=[f"p{int(q * 100)}" for q in QUANTILES]).rename_axis("is_fraud", axis=1)
+
+    def kpis(self) -> dict:
+        cells = self.cells
+        total = int(cells["count"].sum())
+        frauds = int(cells.loc[cells["is_fraud"] == 1, "count"].sum())
+        amt_sum = float(cells["amt_sum"].sum())
+        mean = amt_sum / total if total else 0.0
+        variance = float(cells["amt_sumsq"].sum()) / total - mean ** 2 if total else 0.0
+        return {
+            "total": total,
+            "frauds": frauds,
+            "fraud_rate": 100 * frauds / total if total else 0.0,
+            "avg_amt": mean,
+            "std_amt": float(np.sqrt(max(variance, 0.0))),
+            "unique_merchants": int(cells.loc[cells["count"] > 0, "merchant"].nunique()),
+        }
+
+    def timeseries(self, freq: str) -> pd.DataFrame:
+        cells = self.cells.assign(frauds=self.cells["count"] * self.cells["is_fraud"])
+        daily = cells.groupby("day").agg(total=("count", "sum"), frauds=("frauds", "sum"), amt_sum=("amt_sum", "sum"))
+        period = daily.index.to_period(freq).to_timestamp()
+        ts = daily.groupby(period).sum().rename_axis("period").reset_index()
+        ts["avg_amt"] = ts["amt_sum"] / ts["total"]
+        ts["fraud_rate"] = 100 * ts["frauds"] / ts["total"]
+        return ts.drop(columns="amt_sum")
+
+    def by_state(self) -> pd.DataFrame:
+        cells = self.cells.assign(frauds=self.cells["count"] * self.cells["is_fraud"])
+        states = cells.groupby("state", observed=True).agg(total=("count", "sum"), frauds=("frauds", "sum")).reset_index()
+        states["fraud_rate"] = states["frauds"] / states["total"]
+        return states
+
+    def by_merchant_category(self) -> pd.DataFrame:
+        return (
+            self.cells.groupby(["merchant", "category"], observed=True)["count"].sum()
+            .reset_index()
+        )
+
+    def by_weekday(self) -> pd.DataFrame:
+        weekday = self.cells["day"].dt.dayofweek.to_numpy()
+        is_fraud = self.cells["is_fraud"].to_numpy(dtype=np.int64)
+        counts = np.bincount(weekday * 2 + is_fraud, weights=self.cells["count"].to_numpy(), minlength=14)
+        return pd.DataFrame({
+            "weekday": np.repeat(WEEKDAYS, 2),
+            "is_fraud": np.tile([0, 1], 7),
+            "count": counts.astype(np.int64),
+        })
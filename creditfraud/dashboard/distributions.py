@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+
+def amount_edges(amt_max: float, bins: int = 40) -> np.ndarray:
+    """Log-spaced amount bin edges; amounts are heavily right-skewed."""
+    return np.concatenate([[0.0], np.geomspace(1.0, max(amt_max, 1.0) * (1 + 1e-9), bins)])
+
+
+def amount_histogram(amt: np.ndarray, is_fraud: np.ndarray, edges: np.ndarray) -> pd.DataFrame:
+    """Counts per amount bin and class, with each class's share so the rare fraud class stays visible."""
+    bins = len(edges) - 1
+    bin_index = np.clip(np.searchsorted(edges, amt, side="right") - 1, 0, bins - 1)
+    counts = np.bincount(bin_index * 2 + is_fraud, minlength=bins * 2).reshape(bins, 2)
+    totals = np.maximum(counts.sum(axis=0), 1)
+    return pd.DataFrame({
+        "amount_from": np.repeat(edges[:-1], 2),
+        "amount_to": np.repeat(edges[1:], 2),
+        "amount": np.repeat(np.sqrt(np.maximum(edges[:-1], 0.5) * edges[1:]), 2),
+        "is_fraud": np.tile(["0", "1"], bins),
+        "count": counts.ravel(),
+        "share": (counts / totals).ravel(),
+    })
+
+
+def amount_quantiles(amt: np.ndarray, is_fraud: np.ndarray) -> pd.DataFrame:
+    rows = {}
+    for label in (0, 1):
+        values = amt[is_fraud == label]
+        rows[label] = np.quantile(values, QUANTILES) if len(values) else np.full(len(QUANTILES), np.nan)
+    return pd.DataFrame(rows, index=[f"p{int(q * 100)}" for q in QUANTILES]).rename_axis("is_fraud", axis=1)
+
+
+def hour_counts(hour: np.ndarray, is_fraud: np.ndarray) -> pd.DataFrame:
+    counts = np.bincount(hour * 2 + is_fraud, minlength=48)
+    return pd.DataFrame({"hour": np.repeat(np.arange(24), 2), "is_fraud": np.tile(["0", "1"], 24), "count": counts})
@@ -0,0 +1,78 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from creditfraud.utils.dataset import ParquetChunkWriter
+
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+class FilteredExport:
+    """
+    Writes the filtered rows to a file only when a download is requested.
+
+    Rows are streamed chunk by chunk into a file on disk, so no full-size
+    string buffer is ever built. Files are keyed by the filter state, the
+    selected row positions and the format, so downloading the same
+    selection twice writes it once. Only the max_files most recent
+    exports are kept.
+    """
+
+    def __init__(self, df: pd.DataFrame, cache_dir: Path = None, chunksize: int = 100_000, max_files: int = 8):
+        self.df = df
+        self.cache_dir = Path(cache_dir or Path(tempfile.gettempdir()) / "creditfraud_exports")
+        self.chunksize = chunksize
+        self.max_files = max_files
+
+    def path(self, positions: np.ndarray, filter_state: tuple, fmt: str) -> Path:
+        # The positions are part of the key: the same filters over a different load select different rows
+        digest = hashlib.sha1(repr((filter_state, fmt)).encode())
+        digest.update(np.ascontiguousarray(positions, dtype=np.int64).tobytes())
+        key = digest.hexdigest()[:16]
+        return self.cache_dir / f"filtered_{key}.{EXPORT_FORMATS[fmt][0]}"
+
+    def chunks(self, positions: np.ndarray):
+        if len(positions) == 0:
+            yield self.df.iloc[:0]
+        for start in range(0, len(positions), self.chunksize):
+            yield self.df.take(positions[start:start + self.chunksize])
+
+    def write(self, positions: np.ndarray, fmt: str, path: Path):
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        if fmt == "Parquet":
+            with ParquetChunkWriter(tmp_path) as writer:
+                for chunk in self.chunks(positions):
+                    writer.write(pa.Table.from_pandas(chunk, preserve_index=False))
+        else:
+            with open(tmp_path, "wb") as f:
+                for i, chunk in enumerate(self.chunks(positions)):
+                    chunk.to_csv(f, header=i == 0, index=False)
+        os.replace(tmp_path, path)
+
+    def prune(self):
+        files = sorted(self.cache_dir.glob("filtered_*"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in files[self.max_files:]:
+            stale.unlink(missing_ok=True)
+
+    def build(self, positions: np.ndarray, filter_state: tuple, fmt: str) -> Path:
+        path = self.path(positions, filter_state, fmt)
+        if not path.exists():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.write(positions, fmt, path)
+            self.prune()
+        else:
+            path.touch()
+        return path
+
+    def loader(self, positions: np.ndarray, filter_state: tuple, fmt: str):
+        """Returns a no-argument callable for st.download_button; nothing is written until it runs."""
+        def load() -> bytes:
+            with open(self.build(positions, filter_state, fmt), "rb") as f:
+                return f.read()
+        return load
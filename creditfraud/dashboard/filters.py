@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+# Identifier-like columns stay strings; they would gain nothing as categories
+HIGH_CARDINALITY_SHARE = 0.5
+# Always categorical: TransactionIndex and the sidebar filters read their codes
+FILTER_COLUMNS = ["state", "merchant"]
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrinks a raw transactions frame: the filter columns and other repeated
+    strings become categoricals, numbers take the smallest dtype that holds
+    them, and rows are sorted by trans_dt with unparseable timestamps at the end.
+    """
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if col == "trans_dt":
+            continue
+        if pd.api.types.is_string_dtype(series) or series.dtype == object:
+            if col in FILTER_COLUMNS or series.nunique(dropna=True) <= HIGH_CARDINALITY_SHARE * len(series):
+                df[col] = series.astype("category")
+        elif pd.api.types.is_integer_dtype(series) and col not in ("cc_num", "unix_time"):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series) and col not in ("amt",):
+            df[col] = pd.to_numeric(series, downcast="float")
+    df["is_fraud"] = df["is_fraud"].astype(np.int8)
+    return df.sort_values("trans_dt", kind="stable", na_position="last", ignore_index=True)
+
+
+class TransactionIndex:
+    """
+    Filters over a frame from compact_frame without scanning it.
+
+    The date range is a pair of searchsorted bounds on the sorted
+    timestamps, so only the k rows inside it are looked at. State and
+    merchant selections become boolean lookup tables over category codes,
+    so each of those k rows costs one array read. Cards are factorized
+    once, so exact distinct counts need no row copies either.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.times = df["trans_dt"].to_numpy(dtype="datetime64[ns]")
+        self.valid_rows = int(np.count_nonzero(~np.isnat(self.times)))
+        self.amt = df["amt"].to_numpy()
+        self.amt_min = float(self.amt.min()) if len(self.amt) else 0.0
+        self.amt_max = float(self.amt.max()) if len(self.amt) else 0.0
+        self.is_fraud = df["is_fraud"].to_numpy()
+        self.hour = ((self.times.astype(np.int64) // 3_600_000_000_000) % 24).astype(np.int8)
+        self.codes = {col: df[col].cat.codes.to_numpy() for col in FILTER_COLUMNS}
+        self.categories = {col: df[col].cat.categories for col in FILTER_COLUMNS}
+        self.card_codes, cards = pd.factorize(df["cc_num"])
+        self.card_count = len(cards)
+
+    def date_bounds(self, start_date, end_date) -> tuple:
+        start = np.datetime64(start_date, "ns")
+        end = np.datetime64(end_date, "D") + np.timedelta64(1, "D")
+        lo, hi = np.searchsorted(self.times[:self.valid_rows], [start, end.astype("datetime64[ns]")])
+        return int(lo), int(hi)
+
+    def code_table(self, col: str, values: list) -> np.ndarray:
+        # Code -1 (missing) reads the trailing False
+        table = np.zeros(len(self.categories[col]) + 1, dtype=bool)
+        table[self.categories[col].get_indexer(values)] = True
+        table[-1] = False
+        return table
+
+    def select(self, start_date, end_date, amt_range: tuple, states: list, merchants: list, fraud_mode: str) -> np.ndarray:
+        """Returns the positions of the matching rows."""
+        lo, hi = self.date_bounds(start_date, end_date)
+        amt = self.amt[lo:hi]
+        mask = (amt >= amt_range[0]) & (amt <= amt_range[1])
+        if states:
+            mask &= self.code_table("state", states)[self.codes["state"][lo:hi]]
+        if merchants:
+            mask &= self.code_table("merchant", merchants)[self.codes["merchant"][lo:hi]]
+        if fraud_mode == "Fraud only":
+            mask &= self.is_fraud[lo:hi] == 1
+        elif fraud_mode == "Non-fraud only":
+            mask &= self.is_fraud[lo:hi] == 0
+        return lo + np.flatnonzero(mask)
+
+    def distinct_cards(self, positions: np.ndarray) -> int:
+        # Code -1 (missing) marks the trailing slot, which is not counted
+        seen = np.zeros(self.card_count + 1, dtype=bool)
+        seen[self.card_codes[positions]] = True
+        return int(np.count_nonzero(seen[:-1]))
+
+    def rows(self, positions: np.ndarray, columns: list = None) -> pd.DataFrame:
+        """Copies the given rows, and only the given columns when listed."""
+        if columns is None:
+            return self.df.take(positions)
+        return self.df.iloc[positions, [self.df.columns.get_loc(col) for col in columns]]
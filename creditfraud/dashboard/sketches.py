@@ -0,0 +1,94 @@
+import numpy as np
+from creditfraud.utils.sketches import HLL_PRECISION, QUANTILE_ACCURACY, hll_entries, hll_estimate
+
+# Amounts below this share the zero bucket
+MIN_AMOUNT = 0.01
+
+
+class QuantileBuckets:
+    """DDSketch bucket mapping: bucket i covers (gamma^(i-1), gamma^i]."""
+
+    def __init__(self, max_value: float):
+        self.gamma = (1 + QUANTILE_ACCURACY) / (1 - QUANTILE_ACCURACY)
+        self.log_gamma = np.log(self.gamma)
+        self.offset = int(np.ceil(np.log(MIN_AMOUNT) / self.log_gamma))
+        self.size = int(np.ceil(np.log(max(max_value, MIN_AMOUNT)) / self.log_gamma)) - self.offset + 2
+
+    def index(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        index = np.ceil(np.log(np.maximum(values, MIN_AMOUNT)) / self.log_gamma).astype(np.int64) - self.offset + 1
+        return np.where(values < MIN_AMOUNT, 0, np.clip(index, 1, self.size - 1))
+
+    def value(self, index: np.ndarray) -> np.ndarray:
+        upper = self.gamma ** (np.asarray(index, dtype=np.float64) + self.offset - 1)
+        return np.where(index == 0, 0.0, 2 * upper / (self.gamma + 1))
+
+
+def _sparse(cell_ids: np.ndarray, keys: np.ndarray, width: int) -> tuple:
+    # Unique (cell, key) pairs sorted by cell, plus where each cell's run starts
+    combined = cell_ids.astype(np.int64) * width + keys
+    order = np.argsort(combined, kind="stable")
+    combined = combined[order]
+    starts = np.flatnonzero(np.r_[True, combined[1:] != combined[:-1]])
+    return combined[starts], order, starts
+
+
+class CellSketches:
+    """
+    Mergeable sketches for every cube cell, stored sparsely.
+
+    Per cell: HyperLogLog registers for distinct cards and distinct
+    merchants (only the non-zero ones), and DDSketch bucket counts for the
+    amount. Any selection of cells merges into one sketch: register-wise
+    max for HLL, summed bucket counts for DDSketch. The cost depends on the
+    number of stored entries in the selection, at most one per row and
+    usually far fewer.
+
+    Error bounds: distinct counts have ~1.6% relative standard error
+    (about +/-3.2% at 95% confidence); each amount quantile is within 1%
+    relative error of a value at that rank.
+    """
+
+    def __init__(self, cell_ids: np.ndarray, n_cells: int, cards: np.ndarray, merchants: np.ndarray, amt: np.ndarray):
+        self.n_cells = n_cells
+        self.m = 1 << HLL_PRECISION
+        self.hll = {name: self._build_hll(cell_ids, values) for name, values in [("cards", cards), ("merchants", merchants)]}
+
+        self.buckets = QuantileBuckets(float(np.max(amt, initial=MIN_AMOUNT)))
+        keys, order, starts = _sparse(cell_ids, self.buckets.index(amt), self.buckets.size)
+        counts = np.diff(np.r_[starts, len(order)])
+        self.amounts = (self._offsets(keys // self.buckets.size), (keys % self.buckets.size).astype(np.uint16), counts.astype(np.uint32))
+
+    def _offsets(self, entry_cells: np.ndarray) -> np.ndarray:
+        return np.searchsorted(entry_cells, np.arange(self.n_cells + 1))
+
+    def _build_hll(self, cell_ids: np.ndarray, values: np.ndarray) -> tuple:
+        registers, ranks = hll_entries(values)
+        keys, order, starts = _sparse(cell_ids, registers, self.m)
+        max_ranks = np.maximum.reduceat(ranks[order], starts)
+        return self._offsets(keys // self.m), (keys % self.m).astype(np.uint16), max_ranks
+
+    def _gather(self, offsets: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        # Concatenated entry positions of the selected cells, without a Python loop
+        starts, ends = offsets[cells], offsets[cells + 1]
+        lengths = ends - starts
+        total = int(lengths.sum())
+        shift = np.repeat(starts - np.r_[0, np.cumsum(lengths)[:-1]], lengths)
+        return np.arange(total) + shift
+
+    def distinct(self, name: str, cells: np.ndarray) -> float:
+        offsets, registers, ranks = self.hll[name]
+        idx = self._gather(offsets, cells)
+        merged = np.zeros(self.m, dtype=np.uint8)
+        np.maximum.at(merged, registers[idx], ranks[idx])
+        return hll_estimate(merged)
+
+    def quantiles(self, cells: np.ndarray, q: list) -> np.ndarray:
+        offsets, buckets, counts = self.amounts
+        idx = self._gather(offsets, cells)
+        histogram = np.bincount(buckets[idx], weights=counts[idx], minlength=self.buckets.size)
+        total = histogram.sum()
+        if total == 0:
+            return np.full(len(q), np.nan)
+        ranks = np.asarray(q) * (total - 1)
+        return self.buckets.value(np.searchsorted(np.cumsum(histogram), ranks, side="right"))
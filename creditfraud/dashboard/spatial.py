@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+# Cells per map tile side; a tile spans 360 / 2**zoom degrees of longitude
+CELLS_PER_TILE = 16
+METERS_PER_DEGREE = 111_320.0
+
+
+def cell_degrees(zoom: int) -> float:
+    return 360.0 / (2 ** zoom * CELLS_PER_TILE)
+
+
+class SpatialBins:
+    """
+    Grid binning of one pair of coordinate columns at zoom-dependent resolution.
+
+    Cell keys for every row are computed once per zoom level and kept, so a
+    rerun only gathers the keys of the filtered rows and counts them. The
+    result has one row per non-empty cell, so its size depends on the map
+    area and zoom, never on the number of filtered rows.
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, is_fraud: np.ndarray):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.is_fraud = np.asarray(is_fraud, dtype=np.int64)
+        self.valid = ~(np.isnan(self.lat) | np.isnan(self.lon))
+        self.keys = {}
+
+    def cell_keys(self, zoom: int) -> np.ndarray:
+        if zoom not in self.keys:
+            size = cell_degrees(zoom)
+            cols = int(np.ceil(360.0 / size)) + 1
+            row = np.floor((np.where(self.valid, self.lat, 0.0) + 90.0) / size).astype(np.int64)
+            col = np.floor((np.where(self.valid, self.lon, 0.0) + 180.0) / size).astype(np.int64)
+            self.keys[zoom] = np.where(self.valid, row * cols + col, -1)
+        return self.keys[zoom]
+
+    def cells(self, positions: np.ndarray, zoom: int, max_cells: int) -> pd.DataFrame:
+        """Counts and fraud rates per cell for the given rows, coarsening until at most max_cells remain."""
+        positions = positions[self.valid[positions]]
+        while True:
+            keys, inverse = np.unique(self.cell_keys(zoom)[positions], return_inverse=True)
+            if len(keys) <= max_cells or zoom == 0:
+                break
+            zoom -= 1
+
+        size = cell_degrees(zoom)
+        cols = int(np.ceil(360.0 / size)) + 1
+        count = np.bincount(inverse, minlength=len(keys))
+        frauds = np.bincount(inverse, weights=self.is_fraud[positions], minlength=len(keys))
+        return pd.DataFrame({
+            "lat": ((keys // cols) + 0.5) * size - 90.0,
+            "long": ((keys % cols) + 0.5) * size - 180.0,
+            "count": count,
+            "frauds": frauds.astype(np.int64),
+            "fraud_rate": np.round(frauds / np.maximum(count, 1), 4),
+            # Area-true circles: the densest cell fills its square
+            "radius": np.round(size * METERS_PER_DEGREE / 2 * np.sqrt(count / max(count.max(initial=1), 1)), 1),
+        })
@@ -7,13 +7,18 @@ class DataIngestionConfig:
     Configuration class for data ingestion.
     
     Attributes:
-        source_url (str): URL of the source data.
-        local_data_file (Path): Path to the local data file.
-        unzip_dir (Path): Directory to unzip the data.
+        source_url (str): Kaggle dataset handle, or a local directory of CSVs.
+        local_data_file (Path): Directory holding the verified raw CSV copies.
+        dataset_dir (Path): Directory of the partitioned Parquet dataset and its manifest.
+        partition_by_state (bool): Partition each month by state as well.
+        all_schema (dict): Column dtypes from schema.yaml used when parsing the raw CSVs.
     """
     root_dir: Path
     source_URL: str
     local_data_file: Path
+    dataset_dir: Path
+    partition_by_state: bool
+    all_schema: dict
 
 
 @dataclass
@@ -24,13 +29,38 @@ class DataValidationConfig:
     Attributes:
         root_dir (Path): Root directory for data validation.
         STATUS_FILE (Path): Path to the status file.
+        report_file (Path): Path to the per-column JSON validation report.
         unzip_data_dir (Path): Directory where the data is unzipped.
         all_schema (dict): Schema for data validation.
+        chunksize (int): Rows per chunk when streaming the data body.
     """
     root_dir: Path
     STATUS_FILE: Path
     all_schema: dict
     data_path: Path
+    report_file: Path
+    chunksize: int
+
+
+@dataclass
+class EDAConfig:
+    """
+    Configuration class for exploratory data analysis.
+    
+    Attributes:
+        root_dir (Path): Root directory for EDA artifacts.
+        data_path (Path): Path to the input data file or partitioned dataset.
+        all_schema (dict): Column dtypes from schema.yaml used when parsing the data.
+        filters (dict): start_date, end_date and states pushed down to the dataset read.
+        chunksize (int): Rows per chunk of the single profiling pass.
+        max_workers (int): Threads computing per-column statistics, 0 for one per CPU.
+    """
+    root_dir: Path
+    data_path: Path
+    all_schema: dict
+    filters: dict
+    chunksize: int
+    max_workers: int
 
 
 @dataclass
@@ -42,7 +72,229 @@ class DataTransformationConfig:
         root_dir (Path): Root directory for data transformation artifacts.
         data_path (Path): Path to the input data file for transformation.
         test_size (float): Proportion of the dataset to include in the test split.
+        artifact_format (str): Output format of the split artifacts, "csv" or "parquet".
+        all_schema (dict): Column dtypes from schema.yaml used to type the cleaned table.
+        chunksize (int): Rows per chunk for streaming mode, 0 loads the whole file.
+        filters (dict): start_date, end_date and states pushed down to the dataset read.
     """
     root_dir: Path
     data_path: Path
-    test_size: float
\ No newline at end of file
+    test_size: float
+    artifact_format: str
+    all_schema: dict
+    chunksize: int
+    filters: dict
+
+
+@dataclass
+class ArtifactStoreConfig:
+    """
+    Configuration class for the content-addressed artifact store.
+    
+    Attributes:
+        root_dir (Path): Directory holding the stored objects and the per-path hash index.
+    """
+    root_dir: Path
+
+
+@dataclass
+class InstrumentationConfig:
+    """
+    Configuration class for per-stage performance instrumentation.
+    
+    Attributes:
+        enabled (bool): Measure instrumented stage and component calls.
+        trace_memory (bool): Also record tracemalloc peaks, at a cost for allocation-heavy Python code.
+        profile (bool): Write a cProfile dump of each stage to profile_dir.
+        profile_dir (Path): Directory of the cProfile dumps and their text summaries.
+        log_to_mlflow (bool): Log the measurements as metrics of one run per stage.
+        experiment_name (str): MLflow experiment receiving those runs.
+    """
+    enabled: bool
+    trace_memory: bool
+    profile: bool
+    profile_dir: Path
+    log_to_mlflow: bool
+    experiment_name: str
+
+
+@dataclass
+class StageCacheConfig:
+    """
+    Configuration class for the stage cache.
+    
+    Attributes:
+        root_dir (Path): Directory holding one manifest per cached stage.
+        enabled (bool): Whether unchanged stages are skipped.
+        hash_inputs (bool): Fingerprint input files by content hash instead of size and mtime.
+    """
+    root_dir: Path
+    enabled: bool
+    hash_inputs: bool
+
+
+@dataclass
+class FeatureExtractorConfig:
+    """
+    Configuration class for feature extraction.
+    
+    Attributes:
+        root_dir (Path): Root directory for the feature artifacts.
+        data_dir (Path): Directory holding the data transformation artifacts.
+        artifact_format (str): Format of the transformation artifacts, "csv" or "parquet".
+        chunksize (int): Rows processed per batch.
+        city_pop_bins (list): Lower edges of the city_pop buckets.
+        velocity_windows (dict): Per-card count windows, name to seconds.
+    """
+    root_dir: Path
+    data_dir: Path
+    artifact_format: str
+    chunksize: int
+    city_pop_bins: list
+    velocity_windows: dict
+
+
+@dataclass
+class FeatureStoreConfig:
+    """
+    Configuration class for the online per-card feature store.
+    
+    Attributes:
+        root_dir (Path): Root directory for feature store snapshots.
+        snapshot_path (Path): Path of the snapshot file.
+        velocity_windows (dict): Per-card count windows, name to seconds.
+        buffer_size (int): Recent transactions kept per card.
+        ttl_seconds (int): Idle time after which a card is evicted.
+        max_cards (int): Upper bound on the number of cards held.
+    """
+    root_dir: Path
+    snapshot_path: Path
+    velocity_windows: dict
+    buffer_size: int
+    ttl_seconds: int
+    max_cards: int
+
+
+@dataclass
+class ScoringServerConfig:
+    """
+    Configuration class for the local scoring server.
+    
+    Attributes:
+        model_path (Path): Path to the trained model.
+        scorer_path (Path): Path to the NumPy scorer export, preferred over the model.
+        mmap_mode (str): Mode used to memory-map the model arrays.
+        reload_interval (float): Seconds between checks for a new model file.
+        host (str): Interface the server listens on.
+        port (int): Port the server listens on.
+        max_batch_size (int): Transactions scored per vectorized call.
+        max_wait_ms (float): Longest a request waits for its batch to fill.
+        use_feature_store (bool): Whether velocity features come from the online card store.
+        feature_extractor (FeatureExtractorConfig): Settings for the per-transaction features.
+        feature_store (FeatureStoreConfig): Settings for the online card store.
+    """
+    model_path: Path
+    scorer_path: Path
+    mmap_mode: str
+    reload_interval: float
+    host: str
+    port: int
+    max_batch_size: int
+    max_wait_ms: float
+    use_feature_store: bool
+    feature_extractor: FeatureExtractorConfig
+    feature_store: FeatureStoreConfig
+
+
+@dataclass
+class ModelTrainerConfig:
+    """
+    Configuration class for model training.
+    
+    Attributes:
+        root_dir (Path): Root directory for the trained model.
+        data_dir (Path): Directory holding the feature artifacts.
+        artifact_format (str): Format of the feature artifacts, "csv" or "parquet".
+        model_name (str): File name of the saved model.
+        scorer_name (str): File name of the NumPy scorer export.
+        chunksize (int): Rows streamed per training step.
+        numeric_features (list): Columns standardised and fed to the model.
+        categorical_features (list): Columns one-hot encoded for the model.
+        target_column (str): Label column.
+        alpha (float): Elastic-net regularisation strength.
+        l1_ratio (float): Elastic-net mixing between L1 and L2.
+        epochs (int): Passes over the training data.
+    """
+    root_dir: Path
+    data_dir: Path
+    artifact_format: str
+    model_name: str
+    scorer_name: str
+    chunksize: int
+    numeric_features: list
+    categorical_features: list
+    target_column: str
+    alpha: float
+    l1_ratio: float
+    epochs: int
+
+
+@dataclass
+class ModelSearchConfig:
+    """
+    Configuration class for the hyperparameter and feature-subset search.
+    
+    Attributes:
+        root_dir (Path): Root directory for the search results.
+        results_file (Path): JSON file with every evaluated configuration.
+        trainer (ModelTrainerConfig): Data location and features shared with the model trainer.
+        max_rows (int): Rows sampled from the train split.
+        validation_size (float): Share of the sample held out for scoring.
+        n_jobs (int): Worker processes, -1 for one per CPU.
+        alphas (list): Regularisation path, walked from strongest to weakest.
+        l1_ratios (list): Elastic-net mixing values.
+        max_iter (int): Epochs per point on the path.
+        feature_subsets (dict): Named feature lists evaluated next to all features.
+    """
+    root_dir: Path
+    results_file: Path
+    trainer: ModelTrainerConfig
+    max_rows: int
+    validation_size: float
+    n_jobs: int
+    alphas: list
+    l1_ratios: list
+    max_iter: int
+    feature_subsets: dict
+
+@dataclass
+class ModelEvaluationConfig:
+    """
+    Configuration class for model evaluation.
+    
+    Attributes:
+        root_dir (Path): Root directory for the evaluation artifacts.
+        data_dir (Path): Directory holding the feature artifacts.
+        artifact_format (str): Format of the feature artifacts, "csv" or "parquet".
+        model_path (Path): Path to the trained model.
+        metric_file_name (Path): JSON file for the evaluation metrics.
+        curve_file (Path): Parquet file with the metrics at every threshold.
+        chunksize (int): Test rows scored per step.
+        target_column (str): Label column.
+        n_bootstrap (int): Bootstrap resamples for the confidence intervals.
+        confidence_level (float): Coverage of the confidence intervals.
+        false_positive_cost (float): Cost of flagging a legitimate transaction.
+        false_negative_cost (float): Cost of missing a fraudulent transaction.
+    """
+    root_dir: Path
+    data_dir: Path
+    artifact_format: str
+    model_path: Path
+    metric_file_name: Path
+    curve_file: Path
+    chunksize: int
+    target_column: str
+    n_bootstrap: int
+    confidence_level: float
+    false_positive_cost: float
+    false_negative_cost: float
@@ -1,13 +1,20 @@
 from creditfraud.components.data_ingestion import DataIngestion
 from creditfraud.config.configuration import ConfigurationManager
 from creditfraud.logging.logger import logging 
+from creditfraud.utils.instrumentation import instrumented
 
 STAGE_NAME = "Data Ingestion Stage"
 
 class DataIngestionTrainingPipeline:
+    # source_URL only resolves to files when it is a local directory of CSVs; a Kaggle handle adds nothing
+    cache_inputs = ["data_ingestion.source_URL"]
+    cache_outputs = ["data_ingestion.local_data_file", "data_ingestion.dataset_dir"]
+    cache_sections = ["config.data_ingestion"]
+
     def __init__(self):
         pass
 
+    @instrumented()
     def initiate_data_ingestion(self):
             config = ConfigurationManager() # from componennts/configuration.py
             data_ingestion_config = config.get_data_ingestion_config() # from componennts/configuration.py
@@ -3,13 +3,21 @@ from pathlib import Path
 from creditfraud.config.configuration import ConfigurationManager
 from creditfraud.components.data_transformation import DataTransformation
 from creditfraud.logging.logger import logging
+from creditfraud.utils.artifact_store import ArtifactStore
+from creditfraud.utils.tracking import BatchedRunLogger
+from creditfraud.utils.instrumentation import instrumented
 
 STAGE_NAME = "Data Transformation Stage"
 
 class DataTransformationTrainingPipeline:
+    cache_inputs = ["data_transformation.data_path", "data_validation.status_file"]
+    cache_outputs = ["data_transformation.root_dir"]
+    cache_sections = ["config.data_transformation", "schema"]
+
     def __init__(self):
         pass
 
+    @instrumented()
     def initiate_data_transformation(self):
         logging.info(f">>>>>> Starting {STAGE_NAME} <<<<<<")
 
@@ -27,32 +35,39 @@ class DataTransformationTrainingPipeline:
 
             mlflow.set_experiment("FraudDetection_Transformation")
 
-            with mlflow.start_run(run_name="data_transformation"):
+            with mlflow.start_run(run_name="data_transformation") as run, BatchedRunLogger(run.info.run_id) as tracker:
                 logging.info("MLflow run started for Data Transformation.")
-                mlflow.log_param("test_size", data_transformation_config.test_size)
+                tracker.log_params({
+                    "test_size": data_transformation_config.test_size,
+                    "artifact_format": data_transformation_config.artifact_format,
+                    "chunksize": data_transformation_config.chunksize,
+                })
 
                 data_transformation = DataTransformation(
                     config=data_transformation_config
                 )
 
-                cleaned_df, train_df, test_df = data_transformation.run_transformation()
-
-                # Log artifacts
-                mlflow.log_artifact(str(data_transformation_config.root_dir / "cleaned.csv"))
-                mlflow.log_artifact(str(data_transformation_config.root_dir / "train.csv"))
-                mlflow.log_artifact(str(data_transformation_config.root_dir / "test.csv"))
+                if data_transformation_config.chunksize:
+                    summary = data_transformation.run_streaming_transformation()
+                else:
+                    cleaned_df, train_df, test_df = data_transformation.run_transformation()
+                    summary = data_transformation.summarize({
+                        "clean_rows": cleaned_df.shape[0],
+                        "train_rows": train_df.shape[0],
+                        "test_rows": test_df.shape[0],
+                        "train_frauds": int(train_df["is_fraud"].sum()),
+                        "test_frauds": int(test_df["is_fraud"].sum()),
+                    })
 
-                # Metrics
-                mlflow.log_metric("clean_rows", cleaned_df.shape[0])
-                mlflow.log_metric("train_rows", train_df.shape[0])
-                mlflow.log_metric("test_rows", test_df.shape[0])
+                tracker.log_metrics(summary)
 
-                mlflow.log_metric("fraud_rate_train", train_df["is_fraud"].mean())
-                mlflow.log_metric("fraud_rate_test", test_df["is_fraud"].mean())
+                # Outputs are stored once by content; the run only records references to them
+                store = ArtifactStore(config.get_artifact_store_config())
+                store.log_references(tracker, store.put_all(data_transformation.saved_paths))
 
                 logging.info("Data Transformation completed successfully.")
-                logging.info(f"Train shape: {train_df.shape}")
-                logging.info(f"Test shape: {test_df.shape}")
+                logging.info(f"Train rows: {summary['train_rows']}")
+                logging.info(f"Test rows: {summary['test_rows']}")
 
             logging.info(f">>>>>> Completed {STAGE_NAME} <<<<<<")
 
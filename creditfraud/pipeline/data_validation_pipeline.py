@@ -1,13 +1,19 @@
 from creditfraud.components.data_validation import DataValidation
 from creditfraud.config.configuration import ConfigurationManager
 from creditfraud.logging.logger import logging
+from creditfraud.utils.instrumentation import instrumented
 
 STAGE_NAME = "Data Validation Stage"
 
 class DataValidationTrainingPipeline:
+    cache_inputs = ["data_validation.data_path"]
+    cache_outputs = ["data_validation.status_file", "data_validation.report_file"]
+    cache_sections = ["config.data_validation", "schema"]
+
     def __init__(self):
         pass
     
+    @instrumented()
     def initiate_data_validation(self):
         config = ConfigurationManager()
         data_validation_config = config.get_data_validation_config()
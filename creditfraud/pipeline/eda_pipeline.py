@@ -0,0 +1,30 @@
+import mlflow
+from creditfraud.components.explanatory_data_analysis import FraudEDA
+from creditfraud.config.configuration import ConfigurationManager
+from creditfraud.logging.logger import logging
+from creditfraud.utils.tracking import BatchedRunLogger
+from creditfraud.utils.instrumentation import instrumented
+
+STAGE_NAME = "EDA Stage"
+
+class EDATrainingPipeline:
+    cache_inputs = ["eda.data_path"]
+    cache_outputs = ["eda.root_dir"]
+    cache_sections = ["config.eda", "schema.columns"]
+
+    def __init__(self):
+        pass
+
+    @instrumented()
+    def initiate_eda(self):
+        config = ConfigurationManager()
+        eda_config = config.get_eda_config()
+        metrics = FraudEDA(config=eda_config).run_eda()
+
+        mlflow.set_experiment("fraud_detection")
+        with mlflow.start_run(run_name="eda_run") as run, BatchedRunLogger(run.info.run_id) as tracker:
+            # All metrics in batched calls, and the small result tables in one upload
+            tracker.log_metrics(metrics)
+            mlflow.log_artifacts(str(eda_config.root_dir))
+
+        logging.info("EDA completed successfully.")
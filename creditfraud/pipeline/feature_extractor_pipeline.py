@@ -0,0 +1,38 @@
+import mlflow
+from creditfraud.config.configuration import ConfigurationManager
+from creditfraud.components.feature_extractor import FeatureExtractor
+from creditfraud.logging.logger import logging
+from creditfraud.utils.tracking import BatchedRunLogger
+from creditfraud.utils.instrumentation import instrumented
+
+STAGE_NAME = "Feature Extraction Stage"
+
+class FeatureExtractorTrainingPipeline:
+    cache_inputs = ["feature_extractor.data_dir"]
+    cache_outputs = ["feature_extractor.root_dir"]
+    cache_sections = ["config.feature_extractor", "config.data_transformation"]
+
+    def __init__(self):
+        pass
+
+    @instrumented()
+    def initiate_feature_extraction(self):
+        logging.info(f">>>>>> Starting {STAGE_NAME} <<<<<<")
+
+        try:
+            config = ConfigurationManager()
+            feature_extractor_config = config.get_feature_extractor_config()
+
+            mlflow.set_experiment("FraudDetection_Features")
+
+            with mlflow.start_run(run_name="feature_extraction") as run, BatchedRunLogger(run.info.run_id) as tracker:
+                tracker.log_params({"chunksize": feature_extractor_config.chunksize})
+                feature_extractor = FeatureExtractor(config=feature_extractor_config)
+                summary = feature_extractor.run_feature_extraction()
+                tracker.log_metrics(summary)
+
+            logging.info(f">>>>>> Completed {STAGE_NAME} <<<<<<")
+
+        except Exception as e:
+            logging.exception(e)
+            raise e
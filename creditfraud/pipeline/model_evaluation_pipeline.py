@@ -0,0 +1,51 @@
+import mlflow
+from creditfraud.config.configuration import ConfigurationManager
+from creditfraud.components.model_evaluation import ModelEvaluation
+from creditfraud.logging.logger import logging
+from creditfraud.utils.common import save_json
+from creditfraud.utils.tracking import BatchedRunLogger
+from creditfraud.utils.instrumentation import instrumented
+
+STAGE_NAME = "Model Evaluation Stage"
+
+class ModelEvaluationTrainingPipeline:
+    cache_inputs = ["model_evaluation.data_dir", "model_evaluation.model_path"]
+    cache_outputs = ["model_evaluation.root_dir"]
+    cache_sections = ["config.model_evaluation", "config.data_transformation", "params.Evaluation", "schema.target_column"]
+
+    def __init__(self):
+        pass
+
+    @instrumented()
+    def initiate_model_evaluation(self):
+        logging.info(f">>>>>> Starting {STAGE_NAME} <<<<<<")
+
+        try:
+            config = ConfigurationManager()
+            model_evaluation_config = config.get_model_evaluation_config()
+
+            mlflow.set_experiment("FraudDetection_Evaluation")
+
+            with mlflow.start_run(run_name="model_evaluation") as run, BatchedRunLogger(run.info.run_id) as tracker:
+                tracker.log_params({
+                    "n_bootstrap": model_evaluation_config.n_bootstrap,
+                    "false_positive_cost": model_evaluation_config.false_positive_cost,
+                    "false_negative_cost": model_evaluation_config.false_negative_cost,
+                })
+
+                model_evaluation = ModelEvaluation(config=model_evaluation_config)
+                metrics = model_evaluation.evaluate()
+                save_json(model_evaluation_config.metric_file_name, metrics)
+
+                scalars = {name: value for name, value in metrics.items() if isinstance(value, (int, float))}
+                for name, (low, high) in metrics["confidence_intervals"].items():
+                    scalars[f"{name}_ci_low"] = low
+                    scalars[f"{name}_ci_high"] = high
+                tracker.log_metrics(scalars)
+                mlflow.log_artifact(str(model_evaluation_config.metric_file_name))
+
+            logging.info(f">>>>>> Completed {STAGE_NAME} <<<<<<")
+
+        except Exception as e:
+            logging.exception(e)
+            raise e
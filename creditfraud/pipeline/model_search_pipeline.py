@@ -0,0 +1,55 @@
+import mlflow
+from creditfraud.config.configuration import ConfigurationManager
+from creditfraud.components.model_search import ModelSearch
+from creditfraud.logging.logger import logging
+from creditfraud.utils.common import save_json
+from creditfraud.utils.tracking import BatchedRunLogger
+from creditfraud.utils.instrumentation import instrumented
+
+STAGE_NAME = "Model Search Stage"
+
+class ModelSearchTrainingPipeline:
+    cache_inputs = ["model_trainer.data_dir"]
+    cache_outputs = ["model_search.root_dir"]
+    cache_sections = ["config.model_search", "config.model_trainer", "config.data_transformation",
+                      "params.ModelSearch", "schema.target_column"]
+
+    def __init__(self):
+        pass
+
+    @instrumented()
+    def initiate_model_search(self):
+        logging.info(f">>>>>> Starting {STAGE_NAME} <<<<<<")
+
+        try:
+            config = ConfigurationManager()
+            model_search_config = config.get_model_search_config()
+
+            search = ModelSearch(config=model_search_config).run_search()
+            save_json(model_search_config.results_file, search)
+
+            mlflow.set_experiment("FraudDetection_Search")
+
+            # One run for the whole sweep, sent in batched calls
+            with mlflow.start_run(run_name="model_search") as run, BatchedRunLogger(run.info.run_id) as tracker:
+                metrics = {}
+                for row in search["results"]:
+                    key = f"{row['subset']}/l1_{row['l1_ratio']}/alpha_{row['alpha']}"
+                    metrics[f"roc_auc/{key}"] = row["roc_auc"]
+                    metrics[f"pr_auc/{key}"] = row["pr_auc"]
+                best = search["best"]
+                metrics["best_roc_auc"] = best["roc_auc"]
+
+                tracker.log_params({
+                    "search_rows": search["rows"],
+                    "best_subset": best["subset"],
+                    "best_alpha": best["alpha"],
+                    "best_l1_ratio": best["l1_ratio"],
+                })
+                tracker.log_metrics(metrics)
+
+            logging.info(f">>>>>> Completed {STAGE_NAME} <<<<<<")
+
+        except Exception as e:
+            logging.exception(e)
+            raise e
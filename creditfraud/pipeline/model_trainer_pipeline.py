@@ -0,0 +1,44 @@
+import mlflow
+from creditfraud.config.configuration import ConfigurationManager
+from creditfraud.components.model_trainer import ModelTrainer
+from creditfraud.logging.logger import logging
+from creditfraud.utils.tracking import BatchedRunLogger
+from creditfraud.utils.instrumentation import instrumented
+
+STAGE_NAME = "Model Trainer Stage"
+
+class ModelTrainerTrainingPipeline:
+    cache_inputs = ["model_trainer.data_dir"]
+    cache_outputs = ["model_trainer.root_dir"]
+    cache_sections = ["config.model_trainer", "config.data_transformation", "params.ElasticNet", "schema.target_column"]
+
+    def __init__(self):
+        pass
+
+    @instrumented()
+    def initiate_model_trainer(self):
+        logging.info(f">>>>>> Starting {STAGE_NAME} <<<<<<")
+
+        try:
+            config = ConfigurationManager()
+            model_trainer_config = config.get_model_trainer_config()
+
+            mlflow.set_experiment("FraudDetection_Training")
+
+            with mlflow.start_run(run_name="model_trainer") as run, BatchedRunLogger(run.info.run_id) as tracker:
+                tracker.log_params({
+                    "alpha": model_trainer_config.alpha,
+                    "l1_ratio": model_trainer_config.l1_ratio,
+                    "epochs": model_trainer_config.epochs,
+                    "chunksize": model_trainer_config.chunksize,
+                })
+
+                model_trainer = ModelTrainer(config=model_trainer_config)
+                model, summary = model_trainer.train()
+                tracker.log_metrics(summary)
+
+            logging.info(f">>>>>> Completed {STAGE_NAME} <<<<<<")
+
+        except Exception as e:
+            logging.exception(e)
+            raise e
@@ -0,0 +1,139 @@
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from creditfraud.config.configuration import ConfigurationManager
+from creditfraud.utils.stage_cache import StageCache
+from creditfraud.utils.instrumentation import StageSession
+from creditfraud.logging.logger import logging
+
+
+@dataclass
+class Stage:
+    """
+    A node of the training pipeline graph.
+
+    Attributes:
+        name (str): Key used on the command line.
+        pipeline (type): *TrainingPipeline class to instantiate.
+        method (str): Entry point called on the pipeline instance.
+        depends_on (list): Names of the stages that must finish first.
+    """
+    name: str
+    pipeline: type
+    method: str
+    depends_on: list = field(default_factory=list)
+
+    @property
+    def stage_name(self) -> str:
+        return getattr(sys.modules[self.pipeline.__module__], "STAGE_NAME", self.name)
+
+
+def run_stage(stage: Stage, use_cache: bool = True) -> str:
+    """Runs one stage in a worker process and returns its final status."""
+    logging.info(f">>>>>>>>>>>>>>>>>> stage {stage.stage_name} started <<<<<<<<<<<<<<<<")
+    pipeline = stage.pipeline()
+    action = getattr(pipeline, stage.method)
+    config = ConfigurationManager()
+    instrumentation = config.get_instrumentation_config()
+
+    with StageSession(instrumentation, stage.name) if instrumentation.enabled else nullcontext() as session:
+        if use_cache:
+            ran = StageCache(config.get_stage_cache_config(), config).run(pipeline, action)
+        else:
+            action()
+            ran = True
+    if session is not None:
+        session.log_to_mlflow()
+
+    logging.info(f">>>>>>>>>>>>>>>>>> stage {stage.stage_name} completed <<<<<<<<<<<<<<<<\n\nx=====x")
+    return "completed" if ran else "cached"
+
+
+class PipelineRunner:
+    def __init__(self, stages: list, max_workers: int = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers
+        self.check_graph()
+
+    def check_graph(self):
+        # Depth-first search for unknown dependencies and cycles
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline graph has a cycle through stage '{name}'")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{name}' depends on unknown stage '{dependency}'")
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def select(self, only: list = None, skip: list = None) -> list:
+        for name in (only or []) + (skip or []):
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'. Available stages: {', '.join(self.stages)}")
+        selected = only or list(self.stages)
+        return [name for name in self.stages if name in selected and name not in (skip or [])]
+
+    def run(self, only: list = None, skip: list = None, use_cache: bool = True) -> dict:
+        """
+        Runs the selected stages, each as soon as its dependencies are done.
+
+        Stages outside the selection count as already done. After the first
+        failure no new stage is started; running stages are allowed to finish.
+
+        Returns:
+            dict: Status per stage: completed, cached, failed, not run or skipped.
+
+        """
+        selected = self.select(only, skip)
+        status = {name: "skipped" for name in self.stages if name not in selected}
+        done = set(status)
+        pending = list(selected)
+        running = {}
+        started = {}
+        durations = {}
+        failed = False
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                if not failed:
+                    for name in list(pending):
+                        if all(dependency in done for dependency in self.stages[name].depends_on):
+                            pending.remove(name)
+                            started[name] = time.perf_counter()
+                            running[pool.submit(run_stage, self.stages[name], use_cache)] = name
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    durations[name] = time.perf_counter() - started[name]
+                    try:
+                        status[name] = future.result()
+                        done.add(name)
+                    except Exception as e:
+                        logging.exception(e)
+                        status[name] = "failed"
+                        failed = True
+
+                if failed:
+                    for name in pending:
+                        status[name] = "not run"
+                    pending = []
+
+        for name in self.stages:
+            duration = f" in {durations[name]:.1f}s" if name in durations else ""
+            logging.info(f"{self.stages[name].stage_name}: {status[name]}{duration}")
+
+        if failed:
+            raise RuntimeError(f"Pipeline failed: {[name for name, s in status.items() if s == 'failed']}")
+        return status
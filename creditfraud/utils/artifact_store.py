@@ -0,0 +1,118 @@
+import os
+import json
+import hashlib
+import mlflow
+import pyarrow.parquet as pq
+from pathlib import Path
+from creditfraud.entity.config_entity import ArtifactStoreConfig
+from creditfraud.logging.logger import logging as logger
+from creditfraud.utils.partitioned import copy_verified
+
+# MLflow artifact file holding the references of one run
+REFERENCES_FILE = "artifact_refs.json"
+
+
+def scan_file(path: Path) -> tuple:
+    """sha256 and newline count of a file, in one read."""
+    digest = hashlib.sha256()
+    newlines = 0
+    last = b""
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+            newlines += block.count(b"\n")
+            last = block
+    # A last line without a trailing newline still counts
+    if last and not last.endswith(b"\n"):
+        newlines += 1
+    return digest.hexdigest(), newlines
+
+
+class ArtifactStore:
+    """
+    Local content-addressed store for stage outputs.
+
+    Each file is stored once under objects/<first two hex digits>/<sha256>;
+    putting identical content again only returns its reference. Hashes are
+    remembered per path with the file's size, mtime and inode, so an
+    unchanged output is not re-read on the next run. MLflow runs log the
+    references (hash, path, size, rows) rather than copies of the data.
+    """
+
+    def __init__(self, config: ArtifactStoreConfig):
+        self.config = config
+        self.objects_dir = Path(config.root_dir) / "objects"
+        self.index_dir = Path(config.root_dir) / "index"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+    def object_path(self, sha256: str) -> Path:
+        return self.objects_dir / sha256[:2] / sha256
+
+    def _index_path(self, path: Path) -> Path:
+        # One small file per source path, so parallel stages never rewrite a shared index
+        return self.index_dir / f"{hashlib.sha1(str(path.resolve()).encode()).hexdigest()}.json"
+
+    def describe(self, path: Path) -> dict:
+        """Hash, size and row count of a file, from the index when the file is unchanged."""
+        path = Path(path)
+        stat = path.stat()
+        signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        index_path = self._index_path(path)
+        if index_path.exists():
+            with open(index_path, "r") as f:
+                entry = json.load(f)
+            if entry["signature"] == signature:
+                return entry["reference"]
+
+        sha256, newlines = scan_file(path)
+        reference = {
+            "sha256": sha256,
+            "path": str(path),
+            "bytes": stat.st_size,
+            "rows": self.count_rows(path, newlines),
+        }
+        tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"signature": signature, "reference": reference}, f)
+        os.replace(tmp_path, index_path)
+        return reference
+
+    @staticmethod
+    def count_rows(path: Path, newlines: int):
+        if path.suffix == ".parquet":
+            return pq.ParquetFile(path).metadata.num_rows
+        if path.suffix == ".csv":
+            return max(newlines - 1, 0)
+        return None
+
+    def put(self, path: Path) -> dict:
+        """
+        Stores a file if its content is new and returns its reference.
+
+        Returns:
+            dict: sha256, original path, bytes, rows (None when not tabular),
+            store path, and stored (True when this call added new content).
+        """
+        reference = dict(self.describe(path))
+        target = self.object_path(reference["sha256"])
+        reference["stored"] = not target.exists()
+        if reference["stored"]:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if copy_verified(Path(path), target) != reference["sha256"]:
+                os.remove(target)
+                raise IOError(f"{path} changed while it was stored")
+            logger.info(f"Stored {path} as {reference['sha256'][:12]} ({reference['bytes']} bytes)")
+        else:
+            logger.info(f"{path} unchanged, reusing stored object {reference['sha256'][:12]}")
+        reference["store_path"] = str(target)
+        return reference
+
+    def put_all(self, paths: list) -> dict:
+        """References keyed by file name."""
+        return {Path(path).name: self.put(path) for path in paths}
+
+    def log_references(self, tracker, references: dict):
+        """Records references on an MLflow run: one small JSON artifact plus a sha256 tag per file."""
+        mlflow.log_dict(references, REFERENCES_FILE, run_id=tracker.run_id)
+        tracker.set_tags({f"artifact.{name}.sha256": ref["sha256"] for name, ref in references.items()})
@@ -0,0 +1,52 @@
+import os
+import time
+from pathlib import Path
+from creditfraud.logging.logger import logging
+
+
+class ArtifactWatcher:
+    """
+    Holds an object loaded from a file and reloads it when the file changes.
+
+    save_bin replaces files with os.replace, so a changed file shows up as a
+    new inode. The new version is loaded completely before it replaces the
+    current one, and a failed load keeps the old version, so callers always
+    get a whole model. Arrays already memory-mapped from the old file stay
+    valid after it is replaced.
+    """
+
+    def __init__(self, path: Path, loader, check_interval: float = 5.0):
+        self.path = Path(path)
+        self.loader = loader
+        self.check_interval = check_interval
+        self.signature = self.file_signature()
+        self.current = loader(self.path)
+        self.checked_at = time.monotonic()
+
+    def file_signature(self) -> tuple:
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def get(self):
+        now = time.monotonic()
+        if now - self.checked_at >= self.check_interval:
+            self.checked_at = now
+            self.reload_if_changed()
+        return self.current
+
+    def reload_if_changed(self) -> bool:
+        try:
+            signature = self.file_signature()
+        except FileNotFoundError:
+            return False
+        if signature == self.signature:
+            return False
+
+        try:
+            loaded = self.loader(self.path)
+        except Exception as e:
+            logging.warning(f"Keeping the current version of {self.path}, reload failed: {e}")
+            return False
+        self.current, self.signature = loaded, signature
+        logging.info(f"Reloaded {self.path}")
+        return True
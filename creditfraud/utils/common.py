@@ -2,12 +2,15 @@ import os
 import yaml
 import json
 import joblib
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
 from box import ConfigBox
-from typing import Any
 from creditfraud.logging.logger import logging as logger
 from ensure import ensure_annotations
 from box.exceptions import BoxValueError
 from pathlib import Path
+from typing import Optional
 
 
 @ensure_annotations
@@ -81,30 +84,144 @@ def load_json(path: Path) -> ConfigBox:
     
 
 @ensure_annotations
-def save_bin(path: Path, data: Any):
+def save_bin(path: Path, data: object):
     """
     Saves data as a binary file using joblib.
     
+    The file is written uncompressed, so its arrays can be memory-mapped by
+    load_bin, and replaced atomically, so readers never see a partial file.
+    
     Args:
         path (Path): Path to save the binary file.
-        data (Any): Data to save.
+        data (object): Data to save.
         
     """
-    joblib.dump(value = data, filename=path)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    joblib.dump(value = data, filename=tmp_path)
+    os.replace(tmp_path, path)
     logger.info(f"Binary file saved successfully at {path}.")
     
 @ensure_annotations
-def load_bin(path: Path) -> Any:
+def load_bin(path: Path, mmap_mode: Optional[str] = None) -> object:
     """
     Loads data from a binary file using joblib.
     
     Args:
         path (Path): Path to the binary file.
+        mmap_mode (str): Memory-map the arrays with this mode, e.g. "r", instead
+            of reading them into private memory. Processes mapping the same
+            file share one physical copy.
         
     Returns:
-        Any: Loaded data.
+        object: Loaded data.
         
     """
-    data = joblib.load(path)
+    data = joblib.load(path, mmap_mode=mmap_mode)
     logger.info(f"Binary file loaded successfully from {path}.")
-    return data
\ No newline at end of file
+    return data
+
+
+SPLIT_INDEX_FILE = "split_index.npz"
+
+
+@ensure_annotations
+def save_split_artifacts(root_dir: Path, df: pd.DataFrame, train_idx: np.ndarray, test_idx: np.ndarray, artifact_format: str = "csv") -> list:
+    """
+    Saves a cleaned table and its train/test split.
+    
+    With "parquet" the cleaned table is written once as compressed Parquet and
+    the splits are stored as row positions into it (split_index.npz). With
+    "csv" the legacy cleaned.csv, train.csv and test.csv files are written.
+    
+    Args:
+        root_dir (Path): Directory to write the artifacts into.
+        df (pd.DataFrame): Cleaned table.
+        train_idx (np.ndarray): Row positions of the train split.
+        test_idx (np.ndarray): Row positions of the test split.
+        artifact_format (str): "csv" or "parquet".
+        
+    Returns:
+        list: Paths of the written files.
+        
+    """
+    if artifact_format == "parquet":
+        cleaned_path = root_dir / "cleaned.parquet"
+        index_path = root_dir / SPLIT_INDEX_FILE
+        df.to_parquet(cleaned_path, index=False, compression="zstd")
+        np.savez_compressed(index_path, train=train_idx, test=test_idx)
+        logger.info(f"Parquet table saved at {cleaned_path} with split index {index_path}.")
+        return [cleaned_path, index_path]
+
+    if artifact_format != "csv":
+        raise ValueError(f"Unsupported artifact format: {artifact_format}")
+
+    paths = [root_dir / "cleaned.csv", root_dir / "train.csv", root_dir / "test.csv"]
+    df.to_csv(paths[0], index=False)
+    df.iloc[train_idx].to_csv(paths[1], index=False)
+    df.iloc[test_idx].to_csv(paths[2], index=False)
+    logger.info(f"CSV files saved at {root_dir}.")
+    return paths
+
+
+@ensure_annotations
+def load_split(root_dir: Path, split: str, artifact_format: str = "csv", columns: Optional[list] = None) -> pd.DataFrame:
+    """
+    Loads the "cleaned", "train" or "test" table written by save_split_artifacts.
+    
+    Args:
+        root_dir (Path): Directory holding the artifacts.
+        split (str): "cleaned", "train" or "test".
+        artifact_format (str): "csv" or "parquet".
+        columns (list): Optional subset of columns to load.
+        
+    Returns:
+        pd.DataFrame: Requested table.
+        
+    """
+    if artifact_format == "csv":
+        return pd.read_csv(root_dir / f"{split}.csv", usecols=columns)
+
+    df = pd.read_parquet(root_dir / "cleaned.parquet", columns=columns)
+    if split == "cleaned":
+        return df
+    with np.load(root_dir / SPLIT_INDEX_FILE) as index:
+        rows = index[split]
+    return df.iloc[rows].reset_index(drop=True)
+
+
+
+@ensure_annotations
+def iter_split(root_dir: Path, split: str, artifact_format: str = "csv", chunksize: int = 100000, columns: Optional[list] = None):
+    """
+    Iterates over a split written by save_split_artifacts in bounded chunks.
+    
+    Args:
+        root_dir (Path): Directory holding the artifacts.
+        split (str): "cleaned", "train" or "test".
+        artifact_format (str): "csv" or "parquet".
+        chunksize (int): Maximum rows read per chunk.
+        columns (list): Optional subset of columns to load.
+        
+    Yields:
+        pd.DataFrame: Consecutive chunks of the split.
+        
+    """
+    if artifact_format == "csv":
+        yield from pd.read_csv(root_dir / f"{split}.csv", usecols=columns, chunksize=chunksize)
+        return
+
+    source = pq.ParquetFile(root_dir / "cleaned.parquet")
+    selected = None
+    if split != "cleaned":
+        selected = np.zeros(source.metadata.num_rows, dtype=bool)
+        with np.load(root_dir / SPLIT_INDEX_FILE) as index:
+            selected[index[split]] = True
+
+    offset = 0
+    for batch in source.iter_batches(batch_size=chunksize, columns=columns):
+        chunk = batch.to_pandas()
+        if selected is not None:
+            chunk = chunk[selected[offset:offset + len(chunk)]].reset_index(drop=True)
+        offset += batch.num_rows
+        if len(chunk):
+            yield chunk
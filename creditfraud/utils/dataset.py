@@ -0,0 +1,249 @@
+import os
+import hashlib
+import json
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+from pathlib import Path
+from creditfraud.constants import DATASET_CACHE_DIR
+from creditfraud.logging.logger import logging as logger
+from creditfraud.utils.partitioned import is_partitioned, iter_partitioned, read_manifest, read_partitioned
+
+
+# Datasets already opened by this process, keyed by cache file
+_OPEN_DATASETS = {}
+
+
+def arrow_column_types(schema_columns: dict) -> dict:
+    """
+    Maps schema.yaml types to the Arrow types used when parsing the raw CSV.
+
+    Integers are parsed as int64 so that narrow-int range problems are reported
+    by validation instead of failing the parse; datetimes and categoricals stay
+    text exactly as pd.read_csv would return them.
+    """
+    types = {}
+    for col, dtype in schema_columns.items():
+        if dtype.startswith("int"):
+            types[col] = pa.int64()
+        elif dtype.startswith("float"):
+            types[col] = pa.float64()
+        else:
+            types[col] = pa.string()
+    return types
+
+
+class SharedDataset:
+    """
+    Read-only view of a parsed CSV backed by a memory-mapped Arrow file.
+
+    Every stage and process opening the same CSV maps the same file, so the
+    data is parsed once and shared through the page cache. Columns are
+    converted to pandas lazily and only once per process. A partitioned
+    dataset is read from its Parquet files instead, with cache_path
+    pointing at the dataset directory.
+    """
+
+    def __init__(self, table: pa.Table, cache_path: Path):
+        self.table = table
+        self.cache_path = cache_path
+        self._columns = {}
+
+    @property
+    def columns(self) -> list:
+        return self.table.column_names
+
+    @property
+    def num_rows(self) -> int:
+        return self.table.num_rows
+
+    def column(self, name: str) -> pd.Series:
+        if name not in self._columns:
+            self._columns[name] = self.table.column(name).to_pandas().rename(name)
+        return self._columns[name]
+
+    def __getitem__(self, name: str) -> pd.Series:
+        return self.column(name)
+
+    def to_pandas(self, columns: list = None) -> pd.DataFrame:
+        table = self.table.select(columns) if columns else self.table
+        return table.to_pandas()
+
+    def iter_batches(self, chunksize: int, columns: list = None):
+        table = self.table.select(columns) if columns else self.table
+        for batch in table.to_batches(max_chunksize=chunksize):
+            yield batch.to_pandas()
+
+
+class ParquetChunkWriter:
+    """
+    Appends tables chunk by chunk to one Parquet file.
+
+    The schema is fixed by the first chunk, with dictionary (categorical)
+    columns widened to int32 indices so later chunks with more categories
+    still fit.
+    """
+
+    def __init__(self, path: Path, compression: str = "zstd"):
+        self.path = path
+        self.compression = compression
+        self.schema = None
+        self.writer = None
+
+    def write(self, table: pa.Table):
+        if self.writer is None:
+            self.schema = pa.schema(
+                [pa.field(f.name, pa.dictionary(pa.int32(), f.type.value_type))
+                 if pa.types.is_dictionary(f.type) else f for f in table.schema],
+                metadata=table.schema.metadata,
+            )
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+        self.writer.write_table(table.cast(self.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()[:8]
+
+
+def _cache_path(path: Path, column_types: dict, cache_dir: Path) -> Path:
+    # <stem>-<path>-<size and mtime>-<types>: entries of one source path share a prefix,
+    # and entries of its current version share the next part whatever their types
+    stat = path.stat()
+    source = _digest(str(path.resolve()))
+    version = _digest([stat.st_size, stat.st_mtime_ns])
+    types = _digest({k: str(v) for k, v in column_types.items()})
+    return cache_dir / f"{path.stem}-{source}-{version}-{types}.arrow"
+
+
+def _prune_cache(cache_path: Path):
+    # Older versions of the same source would otherwise each keep a full-size file
+    stem, source, version, _ = cache_path.stem.rsplit("-", 3)
+    for stale in cache_path.parent.glob(f"{stem}-{source}-*.arrow"):
+        if stale.stem.rsplit("-", 3)[2] == version:
+            continue
+        _OPEN_DATASETS.pop(stale, None)
+        try:
+            stale.unlink()
+            logger.info(f"Removed outdated dataset cache {stale}.")
+        except OSError as e:
+            # Still mapped by another process on platforms that lock open files
+            logger.info(f"Could not remove outdated dataset cache {stale}: {e}")
+
+
+def _convert_csv(path: Path, column_types: dict, cache_path: Path):
+    # Multithreaded streaming parse, written batch by batch so memory stays bounded
+    reader = pv.open_csv(
+        path,
+        read_options=pv.ReadOptions(use_threads=True, block_size=16 << 20),
+        convert_options=pv.ConvertOptions(column_types=column_types),
+    )
+    # pandas names the unnamed index column "Unnamed: 0"; keep the same names
+    names = [name or f"Unnamed: {i}" for i, name in enumerate(reader.schema.names)]
+    schema = pa.schema([field.with_name(name) for field, name in zip(reader.schema, names)])
+
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for batch in reader:
+            writer.write_batch(pa.RecordBatch.from_arrays(batch.columns, schema=schema))
+    os.replace(tmp_path, cache_path)
+
+
+def dataset_columns(path: Path) -> list:
+    """Column names of a CSV or partitioned dataset, without reading any rows."""
+    path = Path(path)
+    if is_partitioned(path):
+        return read_manifest(path)["columns"]
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def _load_partitioned(path: Path, column_types: dict, filters: dict) -> SharedDataset:
+    # Not kept in _OPEN_DATASETS: unlike a mapped cache file, the table lives in process memory
+    table = read_partitioned(path, **filters)
+    # Types were applied at ingestion; casting only checks them against the schema
+    for col, dtype in column_types.items():
+        if col in table.column_names and table.schema.field(col).type != dtype:
+            table = table.set_column(table.column_names.index(col), col, table.column(col).cast(dtype))
+    logger.info(f"Partitioned dataset read from {path} with {table.num_rows} rows.")
+
+    return SharedDataset(table, path)
+
+
+def load_dataset(path: Path, column_types: dict = None, cache_dir: Path = DATASET_CACHE_DIR, filters: dict = None) -> SharedDataset:
+    """
+    Parses a CSV once and returns a shared, memory-mapped handle to it.
+
+    The first call converts the CSV into an uncompressed Arrow file under
+    cache_dir; later calls from any stage or process map that file without
+    parsing. The cache is keyed by the CSV's path, size, mtime and column types;
+    writing a new entry deletes the entries of older versions of that CSV.
+
+    A partitioned dataset directory (see utils.partitioned) is read
+    directly into memory, and filters (start_date, end_date, states) are
+    pushed down so only the matching partitions are read; chunked readers
+    should use iter_record_batches instead. Filters are ignored for CSVs.
+
+    Args:
+        path (Path): CSV file or partitioned dataset directory to load.
+        column_types (dict): Optional column name to Arrow type mapping.
+        cache_dir (Path): Directory for the Arrow cache files.
+        filters (dict): Optional start_date, end_date and states filters.
+
+    Returns:
+        SharedDataset: Read-only dataset handle.
+
+    """
+    path = Path(path)
+    column_types = column_types or {}
+    if is_partitioned(path):
+        return _load_partitioned(path, column_types, {k: v for k, v in (filters or {}).items() if v})
+    cache_dir = Path(cache_dir)
+    cache_path = _cache_path(path, column_types, cache_dir)
+
+    if cache_path in _OPEN_DATASETS:
+        return _OPEN_DATASETS[cache_path]
+
+    if not cache_path.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Parsing {path} into shared dataset cache {cache_path}.")
+        _convert_csv(path, column_types, cache_path)
+        _prune_cache(cache_path)
+
+    table = pa.ipc.open_file(pa.memory_map(str(cache_path), "r")).read_all()
+    logger.info(f"Shared dataset mapped from {cache_path} with {table.num_rows} rows.")
+
+    dataset = SharedDataset(table, cache_path)
+    _OPEN_DATASETS[cache_path] = dataset
+    return dataset
+
+
+def iter_record_batches(path: Path, chunksize: int, column_types: dict = None, columns: list = None, filters: dict = None):
+    """
+    Streams a CSV or partitioned dataset as Arrow record batches.
+
+    A partitioned dataset is scanned with its filters pushed down and never
+    held in memory as a whole; a CSV goes through the shared Arrow cache of
+    load_dataset, which maps it rather than reading it.
+    """
+    path = Path(path)
+    if is_partitioned(path):
+        filters = {k: v for k, v in (filters or {}).items() if v}
+        types = column_types or {}
+        for batch in iter_partitioned(path, chunksize, columns, **filters):
+            # Types were applied at ingestion; cast only what differs from the schema
+            arrays = [col.cast(types[name]) if name in types and col.type != types[name] else col
+                      for name, col in zip(batch.schema.names, batch.columns)]
+            yield pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+        return
+    table = load_dataset(path, column_types).table
+    yield from (table.select(columns) if columns else table).to_batches(max_chunksize=chunksize)
@@ -0,0 +1,312 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import functools
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from creditfraud.entity.config_entity import InstrumentationConfig
+from creditfraud.logging.logger import logging as logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 1 << 20
+# Functions listed in the text summary written next to each cProfile dump
+PROFILE_TOP = 30
+
+
+def peak_rss() -> int:
+    """High-water mark of the process's resident set size, in bytes."""
+    try:
+        # VmHWM can be reset, unlike ru_maxrss which also keeps the peaks of exited threads
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss() -> bool:
+    """Restarts the VmHWM high-water mark at the current RSS (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def cpu_seconds() -> float:
+    # Every thread of this process plus finished child processes (e.g. the model search pool)
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class Span:
+    """
+    Measurements of one instrumented call.
+
+    Attributes:
+        name (str): Span name, the qualified method name for decorated methods.
+        depth (int): Nesting level, 0 for the outermost span of a stage.
+        wall_seconds (float): Elapsed time.
+        cpu_seconds (float): CPU time of all threads and finished child processes.
+        peak_rss (int): Highest resident set size while the span was open, in bytes.
+        traced_peak (int): Highest tracemalloc total, in bytes; None unless trace_memory is on.
+        rows_in (int): Rows read, when the code reports them.
+        rows_out (int): Rows produced, when the code reports them.
+    """
+
+    def __init__(self, name: str, depth: int = 0):
+        self.name = name
+        self.depth = depth
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_rss = 0
+        self.traced_peak = None
+        self.rows_in = None
+        self.rows_out = None
+
+    def add_rows(self, rows_in: int = 0, rows_out: int = 0):
+        if rows_in:
+            self.rows_in = (self.rows_in or 0) + int(rows_in)
+        if rows_out:
+            self.rows_out = (self.rows_out or 0) + int(rows_out)
+
+    @property
+    def rows_per_second(self):
+        rows = self.rows_in if self.rows_in is not None else self.rows_out
+        if rows is None or self.wall_seconds <= 0:
+            return None
+        return rows / self.wall_seconds
+
+    def metrics(self) -> dict:
+        metrics = {
+            "wall_s": self.wall_seconds,
+            "cpu_s": self.cpu_seconds,
+            "peak_rss_mb": self.peak_rss / MB,
+            "traced_peak_mb": None if self.traced_peak is None else self.traced_peak / MB,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rows_per_s": self.rows_per_second,
+        }
+        return {f"{self.name}.{key}": value for key, value in metrics.items() if value is not None}
+
+    def describe(self) -> str:
+        parts = [f"wall {self.wall_seconds:.3f}s", f"cpu {self.cpu_seconds:.3f}s", f"peak RSS {self.peak_rss / MB:,.1f}MB"]
+        if self.traced_peak is not None:
+            parts.append(f"traced peak {self.traced_peak / MB:,.1f}MB")
+        if self.rows_in is not None:
+            parts.append(f"rows in {self.rows_in:,}")
+        if self.rows_out is not None:
+            parts.append(f"rows out {self.rows_out:,}")
+        if self.rows_per_second is not None:
+            parts.append(f"{self.rows_per_second:,.0f} rows/s")
+        return f"{'  ' * self.depth}{self.name}: {', '.join(parts)}"
+
+
+class StageSession:
+    """
+    Collects the spans of one pipeline stage in the current process.
+
+    Instrumented calls are only measured while a session is open (the
+    runner opens one around each stage); elsewhere, e.g. in the scoring
+    server or the dashboard, they cost one global lookup. A span reads two
+    clocks and the RSS high-water mark on entry and exit. Memory peaks are
+    per span: entering a span records its parent's peak so far and
+    restarts the counters. tracemalloc and cProfile slow Python-heavy code
+    noticeably, so both are opt-in.
+
+    Usage:
+        with StageSession(config, "data_transformation") as session:
+            pipeline.initiate_data_transformation()
+        session.log_to_mlflow()
+    """
+
+    def __init__(self, config: InstrumentationConfig, name: str):
+        self.config = config
+        self.name = name
+        self.spans = []
+        self.stack = []
+        self.thread_id = threading.get_ident()
+        self.profiler = None
+        self.profile_path = None
+        self.started_tracing = False
+
+    def __enter__(self):
+        global _session
+        if self.config.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        if self.config.profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        _session = self
+        return self
+
+    def __exit__(self, *exc):
+        global _session
+        _session = None
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.save_profile()
+        if self.started_tracing:
+            tracemalloc.stop()
+        if self.spans:
+            total = sum(span.wall_seconds for span in self.spans if span.depth == 0)
+            logger.info(f"[perf] {self.name}: {len(self.spans)} spans, {total:.3f}s instrumented")
+
+    @contextmanager
+    def span(self, name: str):
+        span = Span(name, depth=len(self.stack))
+        if self.stack:
+            # Keep the parent's peaks so far before the counters restart for the child
+            parent = self.stack[-1]
+            parent.peak_rss = max(parent.peak_rss, peak_rss())
+            if self.config.trace_memory:
+                parent.traced_peak = max(parent.traced_peak or 0, tracemalloc.get_traced_memory()[1])
+        reset_peak_rss()
+        if self.config.trace_memory:
+            tracemalloc.reset_peak()
+        self.stack.append(span)
+
+        wall, cpu = time.perf_counter(), cpu_seconds()
+        try:
+            yield span
+        finally:
+            span.wall_seconds = time.perf_counter() - wall
+            span.cpu_seconds = cpu_seconds() - cpu
+            span.peak_rss = max(span.peak_rss, peak_rss())
+            if self.config.trace_memory:
+                span.traced_peak = max(span.traced_peak or 0, tracemalloc.get_traced_memory()[1])
+            self.stack.pop()
+            if self.stack:
+                parent = self.stack[-1]
+                parent.peak_rss = max(parent.peak_rss, span.peak_rss)
+                if span.traced_peak is not None:
+                    parent.traced_peak = max(parent.traced_peak or 0, span.traced_peak)
+            self.spans.append(span)
+            logger.info(f"[perf] {span.describe()}")
+
+    def save_profile(self):
+        profile_dir = Path(self.config.profile_dir)
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        self.profile_path = profile_dir / f"{self.name}.prof"
+        self.profiler.dump_stats(self.profile_path)
+        with open(self.profile_path.with_suffix(".txt"), "w") as f:
+            pstats.Stats(str(self.profile_path), stream=f).sort_stats("cumulative").print_stats(PROFILE_TOP)
+        logger.info(f"[perf] cProfile dump for {self.name} saved at {self.profile_path}")
+
+    def metrics_by_step(self) -> list:
+        """Span metrics; the n-th call of a span name goes to step n."""
+        steps, calls = [], {}
+        for span in self.spans:
+            step = calls.get(span.name, 0)
+            calls[span.name] = step + 1
+            if step == len(steps):
+                steps.append({})
+            steps[step].update(span.metrics())
+        return steps
+
+    def log_to_mlflow(self, client=None):
+        """Logs the spans as metrics of one run per stage in the instrumentation experiment."""
+        if not (self.config.log_to_mlflow and self.spans):
+            return
+        try:
+            # Imported here so that components serving requests do not load MLflow
+            from mlflow.exceptions import MlflowException
+            from mlflow.tracking import MlflowClient
+            from creditfraud.utils.tracking import BatchedRunLogger
+
+            client = client or MlflowClient()
+            experiment = client.get_experiment_by_name(self.config.experiment_name)
+            if experiment is None:
+                try:
+                    experiment_id = client.create_experiment(self.config.experiment_name)
+                except MlflowException:
+                    # Another stage process created it first
+                    experiment_id = client.get_experiment_by_name(self.config.experiment_name).experiment_id
+            else:
+                experiment_id = experiment.experiment_id
+
+            run_id = client.create_run(experiment_id, run_name=self.name).info.run_id
+            with BatchedRunLogger(run_id, client) as tracker:
+                tracker.set_tags({"stage": self.name})
+                tracker.log_params({"trace_memory": self.config.trace_memory, "profile": self.config.profile})
+                for step, metrics in enumerate(self.metrics_by_step()):
+                    tracker.log_metrics(metrics, step)
+                if self.profile_path is not None:
+                    client.log_artifact(run_id, str(self.profile_path))
+                    client.log_artifact(run_id, str(self.profile_path.with_suffix(".txt")))
+            client.set_terminated(run_id)
+        except Exception as e:
+            # Telemetry must not fail a stage that has already finished
+            logger.exception(e)
+
+
+_session = None
+
+
+def active_session():
+    """The open session, if the caller runs on the thread that opened it."""
+    session = _session
+    if session is None or session.thread_id != threading.get_ident():
+        return None
+    return session
+
+
+def add_rows(rows_in: int = 0, rows_out: int = 0):
+    """Adds rows to the innermost open span; does nothing outside a session."""
+    session = active_session()
+    if session is not None and session.stack:
+        session.stack[-1].add_rows(rows_in, rows_out)
+
+
+@contextmanager
+def measure(name: str):
+    """Measures a block as a span. Outside a session the yielded span is not timed or recorded."""
+    session = active_session()
+    if session is None:
+        yield Span(name)
+        return
+    with session.span(name) as span:
+        yield span
+
+
+def instrumented(name: str = None, rows_out=None):
+    """
+    Decorator measuring each call of a function or method as a span.
+
+    Args:
+        name (str): Span name, the function's qualified name by default.
+        rows_out: Key of the returned dict, or a callable of the return
+            value, giving the rows the call produced.
+    """
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            session = active_session()
+            if session is None:
+                return func(*args, **kwargs)
+            with session.span(span_name) as span:
+                result = func(*args, **kwargs)
+                if rows_out is not None and result is not None:
+                    span.rows_out = int(rows_out(result) if callable(rows_out) else result[rows_out])
+                return result
+
+        return wrapper
+    return decorate
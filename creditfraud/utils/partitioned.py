@@ -0,0 +1,341 @@
+import os
+import json
+import shutil
+import hashlib
+import datetime
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pathlib import Path
+from creditfraud.logging.logger import logging as logger
+
+MANIFEST_FILE = "manifest.json"
+TIMESTAMP_COLUMN = "trans_date_trans_time"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Columns whose min/max go into the manifest
+STATS_COLUMNS = [TIMESTAMP_COLUMN, "unix_time", "amt", "state"]
+# Hive name for rows whose partition value is missing (unparseable timestamp, no state)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def file_checksum(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def copy_verified(source: Path, target: Path) -> str:
+    """
+    Copies a file atomically and returns its sha256.
+
+    The copy is hashed while it is written, then the temporary file is
+    re-read and compared before being renamed into place, so a reader never
+    sees a partial or corrupted target.
+    """
+    target = Path(target)
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    digest = hashlib.sha256()
+    try:
+        with open(source, "rb") as src, open(tmp_path, "wb") as dst:
+            for block in iter(lambda: src.read(1 << 20), b""):
+                digest.update(block)
+                dst.write(block)
+            dst.flush()
+            os.fsync(dst.fileno())
+        checksum = digest.hexdigest()
+        if file_checksum(tmp_path) != checksum:
+            raise IOError(f"Checksum mismatch while copying {source} to {target}")
+        os.replace(tmp_path, target)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return checksum
+
+
+def parse_timestamps(values):
+    """Timestamp column (array or dataset expression) parsed to timestamp[s]; unparseable values become null."""
+    return pc.strptime(values, format=TIMESTAMP_FORMAT, unit="s", error_is_null=True)
+
+
+def _csv_batches(paths: list, column_types: dict):
+    # Same column naming as load_dataset: the unnamed index column becomes "Unnamed: 0"
+    for path in paths:
+        reader = pv.open_csv(
+            path,
+            read_options=pv.ReadOptions(use_threads=True, block_size=16 << 20),
+            convert_options=pv.ConvertOptions(column_types=column_types),
+        )
+        names = [name or f"Unnamed: {i}" for i, name in enumerate(reader.schema.names)]
+        for batch in reader:
+            yield pa.RecordBatch.from_arrays(batch.columns, names=names)
+
+
+def _file_stats(metadata: pq.FileMetaData, columns: list) -> dict:
+    # Min/max across row groups, taken from the Parquet footer without reading data
+    names = [metadata.schema.column(i).name for i in range(metadata.num_columns)]
+    stats = {}
+    for col in columns:
+        if col not in names:
+            continue
+        index = names.index(col)
+        lows, highs = [], []
+        for rg in range(metadata.num_row_groups):
+            column_stats = metadata.row_group(rg).column(index).statistics
+            if column_stats is not None and column_stats.has_min_max:
+                lows.append(column_stats.min)
+                highs.append(column_stats.max)
+        if lows:
+            stats[col] = {"min": min(lows), "max": max(highs)}
+    return stats
+
+
+def write_partitioned(csv_paths: list, dataset_dir: Path, column_types: dict = None, partition_by_state: bool = True) -> dict:
+    """
+    Converts raw CSVs into a Hive-style partitioned Parquet dataset.
+
+    Rows go to month=YYYY-MM[/state=XX] directories. The partition columns
+    are stored in the directory names only; readers add them back. A
+    manifest lists every file with its row count, checksum and min/max
+    statistics, and is what readers use to skip files. The dataset is
+    written to a temporary directory and swapped in once complete; the
+    previous dataset is only deleted after the new one is in place.
+
+    Args:
+        csv_paths (list): Raw CSV files, read in order.
+        dataset_dir (Path): Directory of the partitioned dataset.
+        column_types (dict): Optional column name to Arrow type mapping.
+        partition_by_state (bool): Also partition each month by state.
+
+    Returns:
+        dict: The manifest.
+    """
+    dataset_dir = Path(dataset_dir)
+    tmp_dir = dataset_dir.with_name(f".{dataset_dir.name}.{os.getpid()}.tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+
+    batches = _csv_batches(csv_paths, column_types or {})
+    first = next(batches, None)
+    if first is None:
+        raise ValueError(f"No rows to partition in the source CSVs: {[str(p) for p in csv_paths]}")
+    columns = first.schema.names
+
+    def with_month(batch: pa.RecordBatch) -> pa.RecordBatch:
+        month = pc.strftime(parse_timestamps(batch.column(TIMESTAMP_COLUMN)), format="%Y-%m")
+        return pa.RecordBatch.from_arrays(batch.columns + [month], names=columns + ["month"])
+
+    def all_batches():
+        yield with_month(first)
+        for batch in batches:
+            yield with_month(batch)
+
+    partition_fields = [("month", pa.string())] + ([("state", pa.string())] if partition_by_state else [])
+    schema = first.schema.append(pa.field("month", pa.string()))
+    written = []
+    ds.write_dataset(
+        pa.RecordBatchReader.from_batches(schema, all_batches()),
+        tmp_dir,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema(partition_fields), flavor="hive"),
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        basename_template="part-{i}.parquet",
+        file_visitor=written.append,
+    )
+
+    files = []
+    for file in sorted(written, key=lambda f: f.path):
+        path = Path(file.path)
+        relative = path.relative_to(tmp_dir).as_posix()
+        partition = dict(part.split("=", 1) for part in relative.split("/")[:-1])
+        files.append({
+            "path": relative,
+            "partition": {key: None if value == NULL_PARTITION else value for key, value in partition.items()},
+            "rows": file.metadata.num_rows,
+            "bytes": path.stat().st_size,
+            "sha256": file_checksum(path),
+            "stats": _file_stats(file.metadata, STATS_COLUMNS),
+        })
+
+    manifest = {
+        "format": "parquet",
+        "partition_by": [name for name, _ in partition_fields],
+        "columns": columns,
+        "rows": sum(f["rows"] for f in files),
+        "sources": [str(p) for p in csv_paths],
+        "files": files,
+    }
+    with open(tmp_dir / MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    # The old dataset is renamed aside, not deleted, until the new one is in place
+    old_dir = dataset_dir.with_name(f".{dataset_dir.name}.{os.getpid()}.old")
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    if dataset_dir.exists():
+        os.replace(dataset_dir, old_dir)
+    try:
+        os.replace(tmp_dir, dataset_dir)
+    except OSError:
+        if old_dir.exists():
+            os.replace(old_dir, dataset_dir)
+        raise
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    logger.info(f"Partitioned dataset written to {dataset_dir}: {manifest['rows']} rows in {len(files)} files")
+    return manifest
+
+
+def read_manifest(dataset_dir: Path) -> dict:
+    with open(Path(dataset_dir) / MANIFEST_FILE) as f:
+        return json.load(f)
+
+
+def is_partitioned(path: Path) -> bool:
+    return (Path(path) / MANIFEST_FILE).exists()
+
+
+def _timestamp_bound(value, end: bool) -> str:
+    # Dates bound whole days: an end date includes every transaction on that day
+    if isinstance(value, datetime.datetime):
+        return value.strftime(TIMESTAMP_FORMAT)
+    text = str(value)
+    if len(text) == 10 and end:
+        day = datetime.date.fromisoformat(text) + datetime.timedelta(days=1)
+        return day.strftime(TIMESTAMP_FORMAT)
+    return datetime.datetime.fromisoformat(text).strftime(TIMESTAMP_FORMAT)
+
+
+def prune_files(manifest: dict, start_date=None, end_date=None, states: list = None) -> list:
+    """Manifest entries that can hold rows matching the filters."""
+    start = _timestamp_bound(start_date, end=False) if start_date else None
+    end = _timestamp_bound(end_date, end=True) if end_date else None
+    selected = []
+    for entry in manifest["files"]:
+        partition = entry["partition"]
+        stats = entry["stats"].get(TIMESTAMP_COLUMN)
+        if start or end:
+            # Timestamps are fixed-width text, so string order is time order
+            if partition.get("month") is None or stats is None:
+                continue
+            if start and stats["max"] < start:
+                continue
+            if end and stats["min"] >= end:
+                continue
+        if states:
+            if "state" in partition:
+                if partition["state"] not in states:
+                    continue
+            elif "state" in entry["stats"]:
+                state_stats = entry["stats"]["state"]
+                if not any(state_stats["min"] <= s <= state_stats["max"] for s in states):
+                    continue
+        selected.append(entry)
+    return selected
+
+
+def _filtered_dataset(dataset_dir: Path, start_date=None, end_date=None, states: list = None) -> tuple:
+    # Dataset over the files the manifest cannot rule out, and the row filter left for the scan
+    manifest = read_manifest(dataset_dir)
+    entries = prune_files(manifest, start_date, end_date, states)
+    logger.info(f"Reading {len(entries)} of {len(manifest['files'])} files from {dataset_dir}")
+    if not entries:
+        return manifest, None, None
+
+    partitioning = ds.partitioning(
+        pa.schema([(name, pa.string()) for name in manifest["partition_by"]]), flavor="hive"
+    )
+    dataset = ds.dataset(
+        [str(dataset_dir / entry["path"]) for entry in entries],
+        format="parquet",
+        partitioning=partitioning,
+        partition_base_dir=str(dataset_dir),
+    )
+    condition = None
+    timestamps = parse_timestamps(ds.field(TIMESTAMP_COLUMN))
+    if start_date:
+        start = pa.scalar(datetime.datetime.strptime(_timestamp_bound(start_date, end=False), TIMESTAMP_FORMAT), pa.timestamp("s"))
+        condition = timestamps >= start
+    if end_date:
+        end = pa.scalar(datetime.datetime.strptime(_timestamp_bound(end_date, end=True), TIMESTAMP_FORMAT), pa.timestamp("s"))
+        condition = timestamps < end if condition is None else condition & (timestamps < end)
+    if states:
+        in_states = ds.field("state").isin(list(states))
+        condition = in_states if condition is None else condition & in_states
+    return manifest, dataset, condition
+
+
+def partition_scanner(dataset_dir: Path, columns: list = None, start_date=None, end_date=None, states: list = None,
+                      batch_size: int = 131072):
+    """
+    Scanner over a partitioned dataset with date and state filters pushed down.
+
+    Files are first pruned with the manifest (partition values and min/max
+    timestamps), then the remaining row filter runs inside the Parquet scan.
+    Rows come out with the columns and column order of the source CSV.
+
+    Args:
+        dataset_dir (Path): Directory written by write_partitioned.
+        columns (list): Columns to read, all by default.
+        start_date: First date (or datetime) to include.
+        end_date: Last date to include, or an exclusive datetime bound.
+        states (list): States to include, all when empty.
+        batch_size (int): Maximum rows per record batch.
+
+    Returns:
+        ds.Scanner: Scanner over the matching rows, or None if no file can match.
+    """
+    manifest, dataset, condition = _filtered_dataset(Path(dataset_dir), start_date, end_date, states)
+    if dataset is None:
+        return None
+    return dataset.scanner(columns=list(columns or manifest["columns"]), filter=condition, batch_size=batch_size)
+
+
+def read_partitioned(dataset_dir: Path, columns: list = None, start_date=None, end_date=None, states: list = None) -> pa.Table:
+    """Matching rows of a partitioned dataset as one table, see partition_scanner."""
+    scanner = partition_scanner(dataset_dir, columns, start_date, end_date, states)
+    if scanner is None:
+        manifest = read_manifest(dataset_dir)
+        return _empty_table(Path(dataset_dir), manifest, list(columns or manifest["columns"]))
+    return scanner.to_table()
+
+
+def iter_partitioned(dataset_dir: Path, batch_size: int, columns: list = None, start_date=None, end_date=None, states: list = None):
+    """
+    Matching rows of a partitioned dataset as a stream of record batches.
+
+    Filters as in partition_scanner. Files are scanned one at a time: a
+    whole-dataset scanner reads ahead of a slow consumer (e.g. one
+    converting every batch to pandas) until most of the data is buffered,
+    while a per-file scan holds at most one file. Partition files hold
+    many small row groups, so batches are combined up to batch_size rows.
+    """
+    manifest, dataset, condition = _filtered_dataset(Path(dataset_dir), start_date, end_date, states)
+    if dataset is None:
+        return
+    columns = list(columns or manifest["columns"])
+    pending, rows = [], 0
+    for fragment in dataset.get_fragments(filter=condition):
+        for batch in fragment.to_batches(schema=dataset.schema, columns=columns, filter=condition, batch_size=batch_size):
+            if not batch.num_rows:
+                continue
+            pending.append(batch)
+            rows += batch.num_rows
+            if rows >= batch_size:
+                table = pa.Table.from_batches(pending).combine_chunks()
+                yield from table.slice(0, batch_size).to_batches()
+                rest = table.slice(batch_size)
+                pending, rows = rest.to_batches(), rest.num_rows
+    if rows:
+        yield from pa.Table.from_batches(pending).combine_chunks().to_batches()
+
+
+def _empty_table(dataset_dir: Path, manifest: dict, columns: list) -> pa.Table:
+    # Schema of the first file plus the string partition columns
+    schema = pq.read_schema(dataset_dir / manifest["files"][0]["path"]) if manifest["files"] else pa.schema([])
+    fields = {field.name: field for field in schema}
+    fields.update({name: pa.field(name, pa.string()) for name in manifest["partition_by"]})
+    return pa.schema([fields.get(col, pa.field(col, pa.null())) for col in columns]).empty_table()
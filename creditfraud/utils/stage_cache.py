@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+from typing import Callable
+from creditfraud.entity.config_entity import StageCacheConfig
+from creditfraud.logging.logger import logging as logger
+
+
+class StageCache:
+    """
+    Skips pipeline stages whose inputs have not changed since their last run.
+
+    A stage declares what it depends on through class attributes:
+        cache_inputs (list): "section.key" entries of config.yaml naming input files or directories.
+        cache_outputs (list): "section.key" entries naming the files or directories it writes.
+        cache_sections (list): yaml sections it reads, e.g. "config.data_validation",
+            "params.ElasticNet" or "schema" for a whole file.
+
+    The fingerprint covers the input file signatures, those yaml sections and the
+    source of the creditfraud package. When it matches the
+    recorded manifest and the recorded outputs are untouched, the stage is skipped.
+    """
+
+    def __init__(self, config: StageCacheConfig, manager):
+        self.config = config
+        self.documents = {
+            "config": manager.config,
+            "params": manager.params,
+            "schema": manager.schema,
+        }
+
+    def resolve(self, key: str) -> Path:
+        section, name = key.split(".", 1)
+        return Path(self.documents["config"][section][name])
+
+    def path_signature(self, path: Path, hash_contents: bool) -> list:
+        if not path.exists():
+            return []
+        files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        signature = []
+        for file in files:
+            if hash_contents:
+                digest = hashlib.sha256()
+                with open(file, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(block)
+                signature.append([str(file), digest.hexdigest()])
+            else:
+                stat = file.stat()
+                signature.append([str(file), stat.st_size, stat.st_mtime_ns])
+        return signature
+
+    def code_version(self, stage) -> str:
+        # Source of the whole creditfraud package: stages reach utils, config and entity
+        # code indirectly, and the modules loaded in a worker depend on earlier stages
+        package_dir = Path(sys.modules["creditfraud"].__file__).parent
+        digest = hashlib.sha256()
+        for path in sorted(p for p in package_dir.rglob("*.py") if p.is_file()):
+            digest.update(path.relative_to(package_dir).as_posix().encode())
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    def fingerprint(self, stage) -> str:
+        sections = {}
+        for key in getattr(stage, "cache_sections", []):
+            document, _, section = key.partition(".")
+            content = self.documents[document]
+            sections[key] = content[section] if section else content
+
+        payload = {
+            "inputs": {
+                key: self.path_signature(self.resolve(key), self.config.hash_inputs)
+                for key in getattr(stage, "cache_inputs", [])
+            },
+            "sections": sections,
+            "code": self.code_version(stage),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def outputs_signature(self, stage) -> dict:
+        return {
+            key: self.path_signature(self.resolve(key), hash_contents=False)
+            for key in getattr(stage, "cache_outputs", [])
+        }
+
+    def manifest_path(self, stage) -> Path:
+        return self.config.root_dir / f"{type(stage).__name__}.json"
+
+    def is_fresh(self, stage, fingerprint: str) -> bool:
+        manifest_path = self.manifest_path(stage)
+        if not manifest_path.exists():
+            return False
+
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+
+        outputs = self.outputs_signature(stage)
+        outputs_present = all(outputs.values())
+        return manifest["fingerprint"] == fingerprint and manifest["outputs"] == outputs and outputs_present
+
+    def record(self, stage, fingerprint: str):
+        manifest = {
+            "stage": type(stage).__name__,
+            "fingerprint": fingerprint,
+            "outputs": self.outputs_signature(stage),
+        }
+        tmp_path = self.manifest_path(stage).with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(tmp_path, self.manifest_path(stage))
+
+    def run(self, stage, action: Callable) -> bool:
+        """
+        Runs action() unless the stage is cached.
+
+        Args:
+            stage: Pipeline instance declaring its cache attributes.
+            action (Callable): Stage entry point, e.g. stage.initiate_data_validation.
+
+        Returns:
+            bool: True if the stage ran, False if it was skipped.
+
+        """
+        if not self.config.enabled:
+            action()
+            return True
+
+        fingerprint = self.fingerprint(stage)
+        if self.is_fresh(stage, fingerprint):
+            logger.info(f"{type(stage).__name__} is unchanged since its last run. Reusing recorded outputs.")
+            return False
+
+        action()
+        # Inputs are re-read so the manifest matches what the stage actually consumed
+        self.record(stage, self.fingerprint(stage))
+        return True
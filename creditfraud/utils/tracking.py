@@ -0,0 +1,61 @@
+import time
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+
+# MLflow's per-request limits for log_batch
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+
+
+class BatchedRunLogger:
+    """
+    Sends metrics, params and tags to an MLflow run in batched, asynchronous calls.
+
+    Every log_* call becomes as few log_batch requests as MLflow's limits
+    allow, submitted with synchronous=False so the stage keeps working while
+    they are sent. Leaving the context (or calling wait) blocks until every
+    request has been acknowledged, before the run is closed.
+
+    Usage:
+        with mlflow.start_run() as run, BatchedRunLogger(run.info.run_id) as tracker:
+            tracker.log_params({"alpha": 0.001})
+            tracker.log_metrics(summary)
+    """
+
+    def __init__(self, run_id: str, client: MlflowClient = None):
+        self.run_id = run_id
+        self.client = client or MlflowClient()
+        self.operations = []
+
+    def _submit(self, metrics: list = (), params: list = (), tags: list = ()):
+        operation = self.client.log_batch(self.run_id, metrics=metrics, params=params, tags=tags, synchronous=False)
+        if operation is not None:
+            self.operations.append(operation)
+
+    def log_metrics(self, metrics: dict, step: int = 0):
+        timestamp = int(time.time() * 1000)
+        entries = [Metric(name, float(value), timestamp, step) for name, value in metrics.items()]
+        for start in range(0, len(entries), MAX_METRICS_PER_BATCH):
+            self._submit(metrics=entries[start:start + MAX_METRICS_PER_BATCH])
+
+    def log_params(self, params: dict):
+        entries = [Param(name, str(value)) for name, value in params.items()]
+        for start in range(0, len(entries), MAX_PARAMS_PER_BATCH):
+            self._submit(params=entries[start:start + MAX_PARAMS_PER_BATCH])
+
+    def set_tags(self, tags: dict):
+        entries = [RunTag(name, str(value)) for name, value in tags.items()]
+        for start in range(0, len(entries), MAX_TAGS_PER_BATCH):
+            self._submit(tags=entries[start:start + MAX_TAGS_PER_BATCH])
+
+    def wait(self):
+        operations, self.operations = self.operations, []
+        for operation in operations:
+            operation.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.wait()
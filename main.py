@@ -1,45 +1,45 @@
+import argparse
 from creditfraud.logging.logger import logging
+from creditfraud.pipeline.runner import PipelineRunner, Stage
 from creditfraud.pipeline.data_ingestion_pipeline import DataIngestionTrainingPipeline
 from creditfraud.pipeline.data_transformation_pipeline import DataTransformationTrainingPipeline
 from creditfraud.pipeline.data_validation_pipeline import DataValidationTrainingPipeline
-import pandas as pd
+from creditfraud.pipeline.eda_pipeline import EDATrainingPipeline
+from creditfraud.pipeline.feature_extractor_pipeline import FeatureExtractorTrainingPipeline
+from creditfraud.pipeline.model_trainer_pipeline import ModelTrainerTrainingPipeline
+from creditfraud.pipeline.model_search_pipeline import ModelSearchTrainingPipeline
+from creditfraud.pipeline.model_evaluation_pipeline import ModelEvaluationTrainingPipeline
 
 
-STAGE_NAME = "Data Ingestion Stage"
-try:
-    logging.info(f">>>>>>>>>>>>>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<<<<<")
-    data_ingestion = DataIngestionTrainingPipeline()
-    data_ingestion.initiate_data_ingestion()
-    logging.info(f">>>>>>>>>>>>>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<<<<<\n\nx=====x")
-except Exception as e:
-    logging.exception(e)
-    raise e
+STAGES = [
+    Stage("data_ingestion", DataIngestionTrainingPipeline, "initiate_data_ingestion"),
+    Stage("data_validation", DataValidationTrainingPipeline, "initiate_data_validation", ["data_ingestion"]),
+    Stage("eda", EDATrainingPipeline, "initiate_eda", ["data_validation"]),
+    Stage("data_transformation", DataTransformationTrainingPipeline, "initiate_data_transformation", ["data_validation"]),
+    Stage("feature_extraction", FeatureExtractorTrainingPipeline, "initiate_feature_extraction", ["data_transformation"]),
+    Stage("model_trainer", ModelTrainerTrainingPipeline, "initiate_model_trainer", ["feature_extraction"]),
+    Stage("model_search", ModelSearchTrainingPipeline, "initiate_model_search", ["feature_extraction"]),
+    Stage("model_evaluation", ModelEvaluationTrainingPipeline, "initiate_model_evaluation", ["model_trainer"]),
+]
 
-STAGE_NAME = "Data Validation Stage"
-try:
-    logging.info(f">>>>>>>>>>>>>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<<<<<")
-    data_ingestion = DataValidationTrainingPipeline()
-    data_ingestion.initiate_data_validation()
-    logging.info(f">>>>>>>>>>>>>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<<<<<\n\nx=====x")
-except Exception as e:
-    logging.exception(e)
-    raise e
 
-STAGE_NAME = "EDA Stage"
-try:
-    logging.info(f">>>>>>>>>>>>>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<<<<<")
-    df = pd.read_csv("artifacts/data_ingestion/data/fraud_test.csv")
-    logging.info(f">>>>>>>>>>>>>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<<<<<\n\nx=====x")
-except Exception as e:
-    logging.exception(e)
-    raise e
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the credit fraud training pipeline.")
+    parser.add_argument("--only", nargs="+", metavar="STAGE", help="run only these stages")
+    parser.add_argument("--skip", nargs="+", metavar="STAGE", help="skip these stages")
+    parser.add_argument("--workers", type=int, default=None, help="parallel stage processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="rerun stages even if their inputs are unchanged")
+    parser.add_argument("--list", action="store_true", help="list the stages and exit")
+    args = parser.parse_args()
 
-STAGE_NAME = "Data Transformation Stage"
-try:
-    logging.info(f">>>>>>>>>>>>>>>>>> stage {STAGE_NAME} started <<<<<<<<<<<<<<<<")
-    data_ingestion = DataTransformationTrainingPipeline()
-    data_ingestion.initiate_data_transformation()
-    logging.info(f">>>>>>>>>>>>>>>>>> stage {STAGE_NAME} completed <<<<<<<<<<<<<<<<\n\nx=====x")
-except Exception as e:
-    logging.exception(e)
-    raise e
\ No newline at end of file
+    if args.list:
+        for stage in STAGES:
+            print(f"{stage.name} <- {', '.join(stage.depends_on) or '-'}")
+    else:
+        try:
+            PipelineRunner(STAGES, max_workers=args.workers).run(
+                only=args.only, skip=args.skip, use_cache=not args.no_cache
+            )
+        except Exception as e:
+            logging.exception(e)
+            raise e
@@ -0,0 +1,21 @@
+import argparse
+import asyncio
+from creditfraud.components.scoring_server import ScoringServer
+from creditfraud.config.configuration import ConfigurationManager
+from creditfraud.logging.logger import logging
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the trained fraud model over HTTP.")
+    parser.add_argument("--host", default=None, help="interface to listen on (default: from config.yaml)")
+    parser.add_argument("--port", type=int, default=None, help="port to listen on (default: from config.yaml)")
+    args = parser.parse_args()
+
+    config = ConfigurationManager().get_scoring_server_config()
+    config.host = args.host or config.host
+    config.port = args.port or config.port
+
+    try:
+        asyncio.run(ScoringServer(config).serve())
+    except KeyboardInterrupt:
+        logging.info("Scoring server stopped")